@@ -0,0 +1,148 @@
+# analysis.py — Pruebas estadísticas del dashboard, sin dependencias de Streamlit
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Cada función recibe el DataFrame filtrado y devuelve un resultado simple
+# (dict / DataFrame / None) que la interfaz sólo tiene que mostrar.
+#
+# scipy.stats se importa dentro de cada prueba: cargarlo cuesta casi un
+# segundo y el dashboard no debe pagarlo al arrancar.
+
+import math
+
+import numpy as np
+import pandas as pd
+
+from bootstrap import spearman_ci_by_column
+from grouped_ranks import screen
+import normality
+from permutation import PERMUTATION_MAX_N, permutation_test
+
+
+def split_groups(df, value, group, partition=None):
+    """{nivel: valores no nulos de `value`}; usa `partition` ({nivel: posiciones}) si se da."""
+    if partition is None:
+        return {level: g[value].dropna() for level, g in df.groupby(group, observed=True)}
+    values = df[value]
+    return {level: values.iloc[pos].dropna() for level, pos in partition.items()}
+
+
+def run_normality(series):
+    """Shapiro-Wilk y Anderson-Darling de una serie (ver normality.normality_table)."""
+    name = series.name if series.name is not None else 0
+    return normality.normality_table(series.to_frame(name), [name], qq_points=0)[name]
+
+
+def describe(df, cols):
+    return df[list(cols)].describe().T.rename(columns={"50%": "mediana"})
+
+
+def normality_table(df, cols, tests=True, qq_points=normality.QQ_POINTS):
+    """Pruebas de normalidad y pares QQ de todas las columnas, con una sola ordenación por columna."""
+    return normality.normality_table(df, cols, tests=tests, qq_points=qq_points)
+
+
+def spearman_matrix(df, cols):
+    return df[list(cols)].corr(method="spearman")
+
+
+def spearman_pair(df, a, b):
+    """(rho, p, n) de Spearman entre dos columnas, con casos completos."""
+    tmp = df[[a, b]].dropna()
+    if tmp.shape[0] < 2:
+        return np.nan, np.nan, tmp.shape[0]
+    from scipy import stats
+    rho, p = stats.spearmanr(tmp[a], tmp[b])
+    return rho, p, tmp.shape[0]
+
+
+def spearman_table(df, target, variables, bootstrap=True, n_boot=1000, method="percentile"):
+    """Tabla ρ / p / IC bootstrap de `target` contra cada variable (ρ y p sin redondear)."""
+    others = [v for v in variables if v != target]
+    cis = spearman_ci_by_column(df, target, others, n_boot=n_boot, method=method) if bootstrap else {}
+    rows = []
+    for v in others:
+        rho, p, n = spearman_pair(df, target, v)
+        if n < 5:
+            rows.append({"variable": v, "rho": np.nan, "p": np.nan, "rho_CI95": "n<5"})
+            continue
+        ci_text = "NA"
+        if v in cis:
+            lo, hi = cis[v]
+            ci_text = f"[{lo:.3f}, {hi:.3f}]"
+        rows.append({"variable": v, "rho": rho, "p": p, "rho_CI95": ci_text})
+    return pd.DataFrame(rows)
+
+
+def spearman_pairs(table, variables):
+    """{variable: (rho, p)} tomados de una tabla de spearman_table, sin volver a calcular."""
+    if table.empty:
+        return {}
+    rows = table.set_index("variable")
+    return {v: (rows.at[v, "rho"], rows.at[v, "p"]) for v in variables if v in rows.index}
+
+
+def _with_permutation(res, groups, kind, p_method):
+    if p_method == "asymptotic":
+        return res
+    if p_method != "permutation":
+        raise ValueError(f"Método de p-valor no soportado: {p_method}")
+    if np.isnan(res["p"]):
+        # p asintótico indefinido (p. ej. un estrato sin datos): no hay nada que permutar
+        return res
+    n = sum(len(g) for g in groups)
+    if n > PERMUTATION_MAX_N:
+        # a este tamaño el p asintótico es preciso y permutar costaría segundos
+        return dict(res, permutation_skipped=n)
+    perm = permutation_test(groups, kind=kind)
+    return dict(res, p_asymptotic=res["p"], p=perm["p"], n_perm=perm["n_perm"])
+
+
+def mann_whitney(df, value="Horas_Uso", group="Nomofobia?", levels=("Sí", "No"), partition=None,
+                 p_method="asymptotic"):
+    """U, p, z y tamaño de efecto r; None si algún grupo tiene menos de 3 observaciones.
+
+    Con p_method="permutation", p es el p-valor por permutación y el asintótico
+    queda en "p_asymptotic"; con más de PERMUTATION_MAX_N observaciones se deja
+    el asintótico y "permutation_skipped" guarda N.
+    """
+    groups = split_groups(df, value, group, partition)
+    empty = pd.Series(dtype=float)
+    a = groups.get(levels[0], empty)
+    b = groups.get(levels[1], empty)
+    if len(a) < 3 or len(b) < 3:
+        return None
+    from scipy import stats
+    U, p_u = stats.mannwhitneyu(a, b, alternative="two-sided")
+    n1, n2 = len(a), len(b)
+    mu_U = n1 * n2 / 2
+    sigma_U = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
+    z = (U - mu_U) / sigma_U if sigma_U > 0 else 0
+    r = z / math.sqrt(n1 + n2)
+    res = {"U": U, "p": p_u, "z": z, "r": r, "n1": n1, "n2": n2}
+    return _with_permutation(res, [a, b], "mw", p_method)
+
+
+def kruskal(df, value="Nomofobia", group="Estrato", partition=None, p_method="asymptotic"):
+    """H y p de Kruskal–Wallis; None si hay menos de 2 grupos (p_method como en mann_whitney)."""
+    groups = list(split_groups(df, value, group, partition).values())
+    if len(groups) < 2:
+        return None
+    from scipy import stats
+    H, p_kw = stats.kruskal(*groups)
+    return _with_permutation({"H": H, "p": p_kw, "k": len(groups)}, groups, "kw", p_method)
+
+
+def dunn(df, value="Nomofobia", group="Estrato", p_adjust="bonferroni", partition=None):
+    """Matriz de p-valores ajustados de Dunn (como scikit_posthocs.posthoc_dunn); vacía con menos de 2 grupos."""
+    partitions = None if partition is None else {group: partition}
+    res = screen(df, [value], [group], p_adjust=p_adjust, partitions=partitions)["dunn"]
+    return res.get((value, group), pd.DataFrame())
+
+
+def group_summary(df, group, value, partition=None):
+    if partition is None:
+        return df.groupby(group, observed=True)[value].agg(["count", "mean", "median", "std"]).reset_index()
+    values = df[value]
+    rows = [{group: level, "count": s.count(), "mean": s.mean(), "median": s.median(), "std": s.std()}
+            for level, s in ((level, values.iloc[pos]) for level, pos in partition.items())]
+    return pd.DataFrame(rows, columns=[group, "count", "mean", "median", "std"])
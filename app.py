@@ -5,16 +5,9 @@
 # Título mostrado: "Análisis de Nomofobia y Dependencia al Smartphone"
 
 import streamlit as st
-import pandas as pd
-import numpy as np
-from scipy import stats
-from scipy.stats import anderson, shapiro, probplot
-import plotly.express as px
-import plotly.graph_objects as go
-import scikit_posthocs as sp
 from pathlib import Path
-import matplotlib.pyplot as plt
-import math
+import functools
+from instrumentation import Profiler
 
 # -------------------- Metadatos --------------------
 AUTHORS = "Johann Smith Rivera & Julian Mateo Valderrama"
@@ -23,6 +16,11 @@ UNIVERSITY = "Universidad Santo Tomás"
 PROF = "Javier Sierra"
 YEAR = "2025"
 
+# "thread", "process" o "serial" para las pruebas estadísticas independientes
+EXECUTOR_MODE = "thread"
+# segundos entre refrescos del panel de diagnóstico (sólo si está abierto)
+DIAGNOSTICS_REFRESH_S = 5
+
 # -------------------- Configuración de página --------------------
 st.set_page_config(
     page_title="Análisis de Nomofobia y Dependencia al Smartphone",
@@ -67,23 +65,77 @@ st.markdown(f"**Autores:** {AUTHORS}  • {YEAR}")
 st.caption("Dashboard nomofobia | Estadística No Paramétrica | Johann Rivera & Julian Valderrama | 2025")
 st.markdown("---")
 
+# Trazas por sesión (tiempo, CPU, memoria, filas, caché) de cada sección
+if "profiler" not in st.session_state:
+    st.session_state["profiler"] = Profiler()
+profiler = st.session_state["profiler"]
+profiler.new_run()
+
+# -------------------- Dependencias del análisis --------------------
+# Se importan después de la portada para que una sesión nueva la vea sin esperar
+# a numpy/pandas/plotly. scipy.stats lo carga cada prueba al ejecutarse
+# (analysis.py); el QQ-plot es plotly, sin matplotlib.
+with profiler.span("imports"):
+    import numpy as np
+    import plotly.express as px
+    from pandas.api.types import is_numeric_dtype
+    from data_loader import CATEGORICAL_COLS, DATA_PATH, NUMERIC_COLS, SharedDataset, file_fingerprint, load_dataset
+    from results_cache import ResultsCache, filter_key
+    from filters import FILTER_COLS, CategoricalIndex
+    from streaming import frame_descriptives
+    import analysis
+    import engine
+    import grouped_ranks
+    from executor import SectionExecutor, SectionTimeout
+    from permutation import PERMUTATION_MAX_N
+    import rendering
+
 # -------------------- CARGA DE DATOS (asumida presente) --------------------
-df = pd.read_excel("DATOS REALES.xlsx")
-df.columns = df.columns.str.strip()
+# Parseo + limpieza una sola vez por versión del archivo (mtime/tamaño/hash),
+# compartido e inmutable entre sesiones (tipos compactos, columnas numéricas
+# sobre el sidecar Arrow mapeado en memoria, que sobrevive a reinicios).
+@st.cache_resource(show_spinner="Cargando datos...")
+def get_dataset(path, version):
+    return SharedDataset(load_dataset(path))
+
+dataset_version = file_fingerprint(DATA_PATH)
+dataset = get_dataset(str(DATA_PATH), dataset_version)
+df = dataset.frame
+
+# Resultados de pruebas memoizados por (versión de datos, filtros, prueba, parámetros)
+@st.cache_resource
+def get_results_cache():
+    return ResultsCache()
+
+results_cache = get_results_cache()
+
+# Pool compartido para ejecutar en paralelo las pruebas independientes
+@st.cache_resource
+def get_section_executor():
+    return SectionExecutor(results_cache, mode=EXECUTOR_MODE)
+
+section_executor = get_section_executor()
+
+# Códigos enteros + bitmaps por nivel de las columnas categóricas (una vez por versión)
+@st.cache_resource
+def get_filter_index(version):
+    return CategoricalIndex(df)
 
-# limpieza mínima (asumimos columnas presentes)
-df["Sexo"] = df["Sexo"].astype(str).str.strip()
-df["Estrato"] = df["Estrato"].astype(str).str.strip()
-df["Nomofobia?"] = df["Nomofobia?"].astype(str).str.strip()
-for col in ["Horas_Uso", "Nomofobia", "Ansiedad_social", "Autoestima", "Edad", "Mal_uso"]:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce")
+filter_index = get_filter_index(dataset_version)
+
+# Acumuladores descriptivos por celda Sexo × Estrato × Nomofobia?, desde el
+# DataFrame compartido (no se vuelve a leer el archivo fuente)
+@st.cache_resource(show_spinner="Calculando descriptivas...")
+def get_descriptive_cells(version):
+    return frame_descriptives(df, engine.NUMERIC_COLS, by=FILTER_COLS)
+
+descriptive_cells = get_descriptive_cells(dataset_version)
 
 # -------------------- SIDEBAR: filtros y opciones --------------------
 st.sidebar.header("Parámetros de la visualización")
-sexo_options = df["Sexo"].dropna().unique().tolist()
-estrato_options = df["Estrato"].dropna().unique().tolist()
-nomob_options = df["Nomofobia?"].dropna().unique().tolist()
+sexo_options = filter_index.options("Sexo")
+estrato_options = filter_index.options("Estrato")
+nomob_options = filter_index.options("Nomofobia?")
 
 sexo_sel = st.sidebar.multiselect("Sexo", options=sexo_options, default=sexo_options)
 estrato_sel = st.sidebar.multiselect("Estrato", options=estrato_options, default=estrato_options)
@@ -92,10 +144,82 @@ nomob_sel = st.sidebar.multiselect("Nomofobia? (Sí/No)", options=nomob_options,
 show_normality = st.sidebar.checkbox("Mostrar pruebas de normalidad (Shapiro + Anderson-Darling)", value=False)
 show_density = st.sidebar.checkbox("Mostrar densidades (violines)", value=True)
 bootstrap_spearman = st.sidebar.checkbox("Bootstrapped CI (Spearman)", value=True)
-nboots = 1000
+nboots = st.sidebar.select_slider("Remuestreos bootstrap (B)", options=[500, 1000, 2000, 5000, 10000], value=1000)
+ci_method = st.sidebar.radio("Tipo de intervalo bootstrap", ["percentile", "bca"],
+                             format_func=lambda m: "Percentil" if m == "percentile" else "BCa", horizontal=True)
+p_method = "permutation" if st.sidebar.checkbox("P-valores por permutación (Mann–Whitney / Kruskal–Wallis)", value=False) else "asymptotic"
+parallel_sections = st.sidebar.checkbox("Ejecutar pruebas en paralelo", value=section_executor.parallel,
+                                        disabled=not section_executor.parallel)
+show_diagnostics = st.sidebar.checkbox("Diagnóstico de rendimiento", value=False)
+if show_diagnostics:
+    profiler.track_memory = st.sidebar.checkbox("Medir memoria (tracemalloc, más lento)", value=False)
+else:
+    profiler.track_memory = False
+# se llena al final del script, cuando ya se midieron todas las secciones
+diagnostics_panel = st.sidebar.container()
 
 # Filter
-df_f = df[df["Sexo"].isin(sexo_sel) & df["Estrato"].isin(estrato_sel) & df["Nomofobia?"].isin(nomob_sel)]
+selection = {"Sexo": sexo_sel, "Estrato": estrato_sel, "Nomofobia?": nomob_sel}
+with profiler.span("filtro", rows=len(df)):
+    filter_rows = filter_index.rows(selection)
+    # sin filtros activos df_f es el mismo DataFrame compartido (sin copia)
+    df_f = dataset.select(filter_rows)
+current_filters = filter_key(dataset_version[2], sexo_sel, estrato_sel, nomob_sel)
+_partitions = {}
+
+def group_partition(col):
+    """{nivel: posiciones en df_f} de `col` desde el índice de filtros; None si la columna no está indexada."""
+    if col not in filter_index.codes:
+        return None
+    if col not in _partitions:
+        _partitions[col] = filter_index.partition(col, filter_rows)
+    return _partitions[col]
+
+def _task(fn, args, partition_by, params):
+    key = (current_filters, fn.__name__, args, tuple(sorted(params.items())))
+    if isinstance(partition_by, tuple):
+        parts = {c: group_partition(c) for c in partition_by if c in filter_index.codes}
+        params = dict(params, partitions=parts)
+    elif partition_by is not None and partition_by in filter_index.codes:
+        params = dict(params, partition=group_partition(partition_by))
+    return key, params
+
+def cached(fn, *args, partition_by=None, **params):
+    """Ejecuta fn(df_f, *args, **params) una sola vez por estado de filtros.
+
+    Con `partition_by`, los grupos de esa columna (o columnas, si es una tupla)
+    se toman del índice categórico.
+    Si la prueba ya se envió al pool (prefetch), espera ese resultado.
+    """
+    key = (current_filters, fn.__name__, args, tuple(sorted(params.items())))
+
+    def compute():
+        _, full_params = _task(fn, args, partition_by, params)
+        return fn(df_f, *args, **full_params)
+
+    with profiler.span(f"prueba:{fn.__name__}", rows=len(df_f)):
+        profiler.note_cache(key in results_cache)
+        return section_executor.get(key, compute)
+
+def prefetch(fn, *args, partition_by=None, **params):
+    """Envía la prueba al pool sin esperar; `cached` recogerá el resultado."""
+    if parallel_sections:
+        key, full_params = _task(fn, args, partition_by, params)
+        section_executor.submit(key, fn, df_f, *args, **full_params)
+
+def section(fn):
+    """Sección como fragmento con su propio span; si su prueba excede el tiempo límite se avisa en lugar de fallar."""
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        if not profiler.in_script:
+            # rerun sólo de este fragmento: se registra como un rerun aparte
+            profiler.new_run(fn.__name__)
+        try:
+            with profiler.span(fn.__name__, rows=len(df_f)):
+                return fn(*args, **kwargs)
+        except SectionTimeout as e:
+            st.warning(f"{e} — el cálculo sigue en segundo plano; vuelve a ejecutar para ver el resultado.")
+    return st.fragment(run)
 
 # -------------------- CONTEXTO AMPLIADO --------------------
 st.subheader("Contexto y objetivos")
@@ -109,302 +233,367 @@ st.write(
 )
 st.markdown("---")
 
+def show_table(df, fmt, **kwargs):
+    """st.dataframe con formato numérico de Streamlit (DataFrame.style importaría matplotlib).
+
+    `fmt`: formato printf para todas las columnas numéricas, o {columna: formato}.
+    """
+    formats = fmt if isinstance(fmt, dict) else {c: fmt for c in df.columns if is_numeric_dtype(df[c])}
+    config = {str(c): st.column_config.NumberColumn(format=f) for c, f in formats.items()}
+    st.dataframe(df, column_config=config, use_container_width=True, **kwargs)
+
+def show_chart(fig, n_rows=0, **kwargs):
+    """st.plotly_chart + aviso del modo N grande con el tamaño del payload enviado."""
+    with profiler.span("plotly_chart", rows=n_rows):
+        st.plotly_chart(fig, use_container_width=True, **kwargs)
+    if n_rows > rendering.LARGE_N_THRESHOLD:
+        st.caption(f"Modo N grande: {n_rows:,} filas agregadas en servidor • payload ≈ {rendering.payload_kb(fig):,.0f} KB")
+
+# Cada sección numerada y cada explorador es un fragmento (st.fragment): al
+# interactuar con sus widgets sólo se re-ejecuta ese bloque, no todo el script.
+# Los filtros de la barra lateral siguen provocando un rerun completo.
+numeric_cols = [c for c in engine.NUMERIC_COLS if c in df_f.columns]
+spearman_vars = [c for c in engine.SPEARMAN_VARS if c in df_f.columns]
+screen_values = tuple(c for c in NUMERIC_COLS if c in df_f.columns)
+screen_groups = tuple(c for c in CATEGORICAL_COLS if c in df_f.columns)
+
+# Todas las pruebas independientes salen al pool antes de dibujar la primera sección
+with profiler.span("prefetch", rows=len(df_f)):
+    if show_normality:
+        prefetch(analysis.normality_table, tuple(numeric_cols), tests=True)
+    if len(spearman_vars) >= 2:
+        prefetch(analysis.spearman_matrix, tuple(spearman_vars))
+        prefetch(analysis.spearman_table, "Horas_Uso" if "Horas_Uso" in spearman_vars else spearman_vars[0],
+                 tuple(spearman_vars), bootstrap=bootstrap_spearman, n_boot=nboots, method=ci_method)
+    if {"Nomofobia?", "Horas_Uso"}.issubset(df_f.columns):
+        prefetch(analysis.mann_whitney, partition_by="Nomofobia?", p_method=p_method)
+    if {"Estrato", "Nomofobia"}.issubset(df_f.columns):
+        prefetch(analysis.kruskal, partition_by="Estrato", p_method=p_method)
+        prefetch(analysis.dunn, partition_by="Estrato")
+    if screen_values and screen_groups:
+        prefetch(grouped_ranks.screen, screen_values, screen_groups, partition_by=screen_groups, p_adjust="bonferroni")
+
 # -------------------- 1) Descriptivas y Visualizaciones detalladas --------------------
-st.subheader("1) Estadísticas descriptivas y visualizaciones")
-
-numeric_cols = [c for c in ["Horas_Uso", "Nomofobia", "Ansiedad_social", "Autoestima", "Mal_uso"] if c in df_f.columns]
-if numeric_cols:
-    desc = df_f[numeric_cols].describe().T.rename(columns={"50%": "mediana"})
-    st.write("Resumen descriptivo (muestras filtradas):")
-    st.dataframe(desc.style.format("{:.2f}"), use_container_width=True)
-
-# Plots por variable numérica: hist + qq + violin/box
-for col in numeric_cols:
-    st.markdown(f"**Variable:** {col}")
-    c1, c2 = st.columns([1, 1])
-    with c1:
-        fig = px.histogram(df_f, x=col, nbins=30, marginal="box", title=f"Histograma y boxplot — {col}")
-        st.plotly_chart(fig, use_container_width=True)
-    with c2:
-        # Matplotlib QQ-plot to show normality visually
-        figm, ax = plt.subplots(figsize=(5, 4))
-        clean = df_f[col].dropna()
-        if len(clean) >= 3:
-            probplot(clean, dist="norm", plot=ax)
-            ax.set_title(f"QQ-plot — {col}")
-        else:
-            ax.text(0.1, 0.5, "Insuficientes datos para QQ-plot", fontsize=12)
-        st.pyplot(figm)
-    # violin (grouped by Estrato if exists)
-    if "Estrato" in df_f.columns:
-        figv = px.violin(df_f, x="Estrato", y=col, box=True, points="all", title=f"Violin {col} por Estrato")
-        st.plotly_chart(figv, use_container_width=True)
-    st.markdown("---")
+@section
+def section_descriptives(df_f, numeric_cols, selection):
+    st.subheader("1) Estadísticas descriptivas y visualizaciones")
 
-# -------------------- Normality tests (optional) --------------------
-def run_normality(series):
-    s = series.dropna()
-    if len(s) < 3:
-        return {"shapiro_p": np.nan, "anderson_stat": np.nan, "anderson_sig": None}
-    W, p_sh = shapiro(s)
-    ad_res = anderson(s, dist="norm")
-    return {"shapiro_p": p_sh, "anderson_stat": ad_res.statistic, "anderson_critical": ad_res.critical_values, "anderson_significance": ad_res.significance_level}
+    if numeric_cols:
+        desc = descriptive_cells.table(selection, columns=numeric_cols)
+        st.write("Resumen descriptivo (muestras filtradas):")
+        show_table(desc, "%.2f")
 
-if show_normality:
+    # Pares QQ (submuestreados sólo en modo N grande); con las pruebas activas es el mismo
+    # resultado (una sola ordenación por columna) que usa la sección de normalidad
+    qq = cached(analysis.normality_table, tuple(numeric_cols), tests=show_normality) if numeric_cols else {}
+
+    # Plots por variable numérica: hist + qq + violin/box
+    for col in numeric_cols:
+        st.markdown(f"**Variable:** {col}")
+        c1, c2 = st.columns([1, 1])
+        with c1:
+            binned = descriptive_cells.histogram(col, selection, bins=30) if rendering.is_large(df_f) else None
+            fig = rendering.histogram_figure(df_f, col, nbins=30, binned=binned)
+            show_chart(fig, len(df_f))
+        with c2:
+            # QQ-plot to show normality visually
+            with profiler.span("qqplot", rows=len(df_f), column=col):
+                show_chart(rendering.qq_figure(col, qq[col]["qq"]), len(df_f))
+        # violin (grouped by Estrato if exists)
+        if "Estrato" in df_f.columns:
+            figv = rendering.violin_figure(df_f, "Estrato", col, title=f"Violin {col} por Estrato",
+                                           partition=group_partition("Estrato"))
+            show_chart(figv, len(df_f))
+        st.markdown("---")
+
+# -------------------- Normality tests (optional) --------------------
+@section
+def section_normality(numeric_cols):
     st.subheader("Pruebas de normalidad (Shapiro-Wilk y Anderson-Darling)")
+    normality = cached(analysis.normality_table, tuple(numeric_cols), tests=True)
     for col in numeric_cols:
-        res = run_normality(df_f[col])
+        res = normality[col]
         if np.isnan(res["shapiro_p"]):
             st.write(f"{col}: Insuficientes datos para pruebas de normalidad.")
             continue
-        st.write(f"**{col}** — Shapiro p = {res['shapiro_p']:.4f}. Anderson-Darling stat = {res['anderson_stat']:.3f}.")
+        st.write(f"**{col}** — Shapiro p = {res['shapiro_p']:.4f}. Anderson-Darling stat = {res['anderson_stat']:.3f} (p ≈ {res['anderson_p']:.4f}).")
+        if res["shapiro_n"] < res["n"]:
+            st.caption(f"n = {res['n']:,}: Shapiro-Wilk sobre una submuestra estratificada de {res['shapiro_n']:,} observaciones; "
+                       f"D'Agostino–Pearson con la muestra completa: p = {res['dagostino_p']:.4f}.")
         st.write("_Interpretación:_ p<0.05 en Shapiro sugiere desviación de normalidad. Anderson-Darling compara con valores críticos (ver tabla).")
     st.markdown("---")
 
 # -------------------- 2) Correlaciones Spearman (mapa + tabla con CI bootstrapped) --------------------
-st.subheader("2) Correlaciones no paramétricas — Spearman (mapa de calor + tabla con CI)")
-spearman_vars = [c for c in ["Horas_Uso", "Nomofobia", "Ansiedad_social", "Autoestima", "Mal_uso", "Edad"] if c in df_f.columns]
-if len(spearman_vars) >= 2:
-    corr = df_f[spearman_vars].corr(method="spearman")
-    fig_corr = px.imshow(corr, text_auto=True, color_continuous_scale="RdBu_r", zmin=-1, zmax=1, title="Mapa de calor — Correlaciones Spearman")
-    st.plotly_chart(fig_corr, use_container_width=True)
-
-    # Detailed table with bootstrap CI for pairwise with target = Horas_Uso (if present)
-    target = "Horas_Uso" if "Horas_Uso" in spearman_vars else spearman_vars[0]
-    rows = []
-    for v in spearman_vars:
-        if v == target: continue
-        tmp = df_f[[target, v]].dropna()
-        if tmp.shape[0] < 5:
-            rows.append({"variable": v, "rho": np.nan, "p": np.nan, "rho_CI95": "n<5"})
-            continue
-        rho, p = stats.spearmanr(tmp[target], tmp[v], nan_policy="omit")
-        ci_text = "NA"
-        if bootstrap_spearman and tmp.shape[0] >= 10:
-            boots = []
-            rng = np.random.default_rng(12345)
-            x = tmp[target].to_numpy(); y = tmp[v].to_numpy()
-            for _ in range(nboots):
-                idx = rng.integers(0, len(x), len(x))
-                boots.append(stats.spearmanr(x[idx], y[idx]).correlation)
-            lo = np.percentile(boots, 2.5); hi = np.percentile(boots, 97.5)
-            ci_text = f"[{lo:.3f}, {hi:.3f}]"
-        rows.append({"variable": v, "rho": round(rho, 3), "p": round(p, 4), "rho_CI95": ci_text})
-    st.dataframe(pd.DataFrame(rows), use_container_width=True)
-st.markdown("---")
+@section
+def section_spearman(spearman_vars, bootstrap_spearman, nboots, ci_method):
+    st.subheader("2) Correlaciones no paramétricas — Spearman (mapa de calor + tabla con CI)")
+    if len(spearman_vars) >= 2:
+        corr = cached(analysis.spearman_matrix, tuple(spearman_vars))
+        fig_corr = px.imshow(corr, text_auto=True, color_continuous_scale="RdBu_r", zmin=-1, zmax=1, title="Mapa de calor — Correlaciones Spearman")
+        show_chart(fig_corr)
+
+        # Detailed table with bootstrap CI for pairwise with target = Horas_Uso (if present)
+        target = "Horas_Uso" if "Horas_Uso" in spearman_vars else spearman_vars[0]
+        spearman_tbl = cached(analysis.spearman_table, target, tuple(spearman_vars),
+                              bootstrap=bootstrap_spearman, n_boot=nboots, method=ci_method)
+        show_table(spearman_tbl, {"rho": "%.3f", "p": "%.4f"})
+    st.markdown("---")
 
 # -------------------- 3) Mann–Whitney (Horas_Uso by Nomofobia?) --------------------
-st.subheader("3) Test Mann–Whitney — Horas de Uso por Nomofobia (Sí/No)")
-if {"Nomofobia?", "Horas_Uso"}.issubset(df_f.columns):
-    a = df_f[df_f["Nomofobia?"] == "Sí"]["Horas_Uso"].dropna()
-    b = df_f[df_f["Nomofobia?"] == "No"]["Horas_Uso"].dropna()
-    if len(a) >= 3 and len(b) >= 3:
-        U, p_u = stats.mannwhitneyu(a, b, alternative="two-sided")
-        n1, n2 = len(a), len(b)
-        mu_U = n1 * n2 / 2
-        sigma_U = math.sqrt(n1 * n2 * (n1 + n2 + 1) / 12)
-        z = (U - mu_U) / sigma_U if sigma_U > 0 else 0
-        r = z / math.sqrt(n1 + n2)
-        st.write(f"U = {U:.3f}  •  p = {p_u:.4f}  •  z = {z:.3f}  •  r = {r:.3f}")
-        if p_u < 0.05:
-            st.success("Diferencia estadísticamente significativa entre los grupos (p < 0.05).")
+@section
+def section_mann_whitney(df_f):
+    st.subheader("3) Test Mann–Whitney — Horas de Uso por Nomofobia (Sí/No)")
+    if {"Nomofobia?", "Horas_Uso"}.issubset(df_f.columns):
+        mw = cached(analysis.mann_whitney, partition_by="Nomofobia?", p_method=p_method)
+        if mw is not None:
+            U, p_u, z, r = mw["U"], mw["p"], mw["z"], mw["r"]
+            st.write(f"U = {U:.3f}  •  p = {p_u:.4f}  •  z = {z:.3f}  •  r = {r:.3f}")
+            if "n_perm" in mw:
+                st.caption(f"p por permutación ({mw['n_perm']:,} permutaciones); p asintótico = {mw['p_asymptotic']:.4f}.")
+            elif "permutation_skipped" in mw:
+                st.caption(f"N = {mw['permutation_skipped']:,}: se usa el p asintótico (preciso a este tamaño; la permutación se aplica hasta {PERMUTATION_MAX_N:,} observaciones).")
+            if p_u < 0.05:
+                st.success("Diferencia estadísticamente significativa entre los grupos (p < 0.05).")
+            else:
+                st.info("No se detectaron diferencias significativas (p ≥ 0.05).")
+            fig_mw = rendering.box_figure(df_f, "Nomofobia?", "Horas_Uso", color="Nomofobia?", title="Horas de Uso según Nomofobia",
+                                          partition=group_partition("Nomofobia?"))
+            show_chart(fig_mw, len(df_f))
+            # Interpretation
+            st.markdown("**Interpretación detallada (Mann–Whitney):**")
+            st.write(
+                "La prueba compara las distribuciones relativas (órdenes). Un p<0.05 sugiere que la"
+                " distribución de horas difiere entre personas con nomofobia y sin nomofobia. El tamaño de efecto r"
+                f" = {r:.3f} ayuda a evaluar la magnitud práctica (reglas generales: 0.1 pequeño, 0.3 moderado, 0.5 grande)."
+            )
         else:
-            st.info("No se detectaron diferencias significativas (p ≥ 0.05).")
-        fig_mw = px.box(df_f, x="Nomofobia?", y="Horas_Uso", points="all", color="Nomofobia?", title="Horas de Uso según Nomofobia")
-        st.plotly_chart(fig_mw, use_container_width=True)
-        # Interpretation
-        st.markdown("**Interpretación detallada (Mann–Whitney):**")
-        st.write(
-            "La prueba compara las distribuciones relativas (órdenes). Un p<0.05 sugiere que la"
-            " distribución de horas difiere entre personas con nomofobia y sin nomofobia. El tamaño de efecto r"
-            f" = {r:.3f} ayuda a evaluar la magnitud práctica (reglas generales: 0.1 pequeño, 0.3 moderado, 0.5 grande)."
-        )
-    else:
-        st.warning("Insuficientes observaciones en uno de los grupos para Mann–Whitney (mínimo 3 por grupo).")
-st.markdown("---")
+            st.warning("Insuficientes observaciones en uno de los grupos para Mann–Whitney (mínimo 3 por grupo).")
+    st.markdown("---")
 
 # -------------------- 4) Kruskal–Wallis (Nomofobia por Estrato) --------------------
-st.subheader("4) Kruskal–Wallis (Nomofobia por Estrato)")
-if {"Estrato", "Nomofobia"}.issubset(df_f.columns):
-    groups = [g["Nomofobia"].dropna() for _, g in df_f.groupby("Estrato")]
-    if len(groups) > 1:
-        H, p_kw = stats.kruskal(*groups)
-        st.write(f"H = {H:.3f}  •  p = {p_kw:.4f}")
-        st.plotly_chart(px.box(df_f, x="Estrato", y="Nomofobia", color="Estrato", points="all",
-                               title="Nomofobia por Estrato — Kruskal–Wallis"), use_container_width=True)
-        if p_kw < 0.05:
-            st.success("Al menos dos estratos difieren en Nomofobia (p < 0.05).")
+@section
+def section_kruskal(df_f):
+    st.subheader("4) Kruskal–Wallis (Nomofobia por Estrato)")
+    if {"Estrato", "Nomofobia"}.issubset(df_f.columns):
+        kw = cached(analysis.kruskal, partition_by="Estrato", p_method=p_method)
+        if kw is not None:
+            H, p_kw = kw["H"], kw["p"]
+            st.write(f"H = {H:.3f}  •  p = {p_kw:.4f}")
+            if "n_perm" in kw:
+                st.caption(f"p por permutación ({kw['n_perm']:,} permutaciones); p asintótico = {kw['p_asymptotic']:.4f}.")
+            elif "permutation_skipped" in kw:
+                st.caption(f"N = {kw['permutation_skipped']:,}: se usa el p asintótico (preciso a este tamaño; la permutación se aplica hasta {PERMUTATION_MAX_N:,} observaciones).")
+            show_chart(rendering.box_figure(df_f, "Estrato", "Nomofobia", color="Estrato",
+                                            title="Nomofobia por Estrato — Kruskal–Wallis",
+                                            partition=group_partition("Estrato")), len(df_f))
+            if p_kw < 0.05:
+                st.success("Al menos dos estratos difieren en Nomofobia (p < 0.05).")
+            else:
+                st.info("No se evidencian diferencias significativas entre estratos.")
+            st.markdown("**Interpretación (Kruskal–Wallis):**")
+            st.write(
+                "Kruskal–Wallis evalúa si provienen de la misma distribución. Si p<0.05, se procede a post-hoc"
+                " para identificar pares diferentes."
+            )
         else:
-            st.info("No se evidencian diferencias significativas entre estratos.")
-        st.markdown("**Interpretación (Kruskal–Wallis):**")
-        st.write(
-            "Kruskal–Wallis evalúa si provienen de la misma distribución. Si p<0.05, se procede a post-hoc"
-            " para identificar pares diferentes."
-        )
-    else:
-        st.warning("No hay suficientes grupos para Kruskal–Wallis.")
-st.markdown("---")
+            st.warning("No hay suficientes grupos para Kruskal–Wallis.")
+    st.markdown("---")
 
 # -------------------- 5) Post-hoc: Dunn (tabla + heatmap) --------------------
-st.subheader("5) Post-hoc: Dunn (comparaciones por pares, Bonferroni)")
-if {"Estrato", "Nomofobia"}.issubset(df_f.columns):
-    dunn = sp.posthoc_dunn(df_f, val_col="Nomofobia", group_col="Estrato", p_adjust="bonferroni")
-    st.write("Matriz de p-valores ajustados (Bonferroni):")
-    st.dataframe(dunn.style.format("{:.4f}"), use_container_width=True)
-    st.plotly_chart(px.imshow(dunn, text_auto=True, color_continuous_scale="Reds", title="Dunn — p-vals ajustados"), use_container_width=True)
-    st.caption("Celdas con p < 0.05 indican pares de estratos con diferencias en Nomofobia.")
-st.markdown("---")
+@section
+def section_dunn(df_f):
+    st.subheader("5) Post-hoc: Dunn (comparaciones por pares, Bonferroni)")
+    if {"Estrato", "Nomofobia"}.issubset(df_f.columns):
+        dunn = cached(analysis.dunn, partition_by="Estrato")
+        st.write("Matriz de p-valores ajustados (Bonferroni):")
+        show_table(dunn, "%.4f")
+        show_chart(px.imshow(dunn, text_auto=True, color_continuous_scale="Reds", title="Dunn — p-vals ajustados"))
+        st.caption("Celdas con p < 0.05 indican pares de estratos con diferencias en Nomofobia.")
+    st.markdown("---")
 
 # -------------------- Explorador A (bivariado avanzado) --------------------
-st.subheader("6) Explorador A — análisis bivariado avanzado")
-with st.expander("Abrir Explorador A (scatter, trendline, color)"):
-    numeric = [c for c in df_f.columns if np.issubdtype(df_f[c].dtype, np.number)]
-    cat = [c for c in df_f.columns if not np.issubdtype(df_f[c].dtype, np.number)]
-    x = st.selectbox("Eje X (num)", numeric, index=0)
-    y = st.selectbox("Eje Y (num)", numeric, index=1)
-    color = st.selectbox("Color por (categórico)", [None] + cat, index=1 if cat else 0)
-    size = st.selectbox("Tamaño por (num, opcional)", [None] + numeric, index=0)
-    trend = st.selectbox("Trendline", ["none", "ols", "lowess"], index=1)
-    fig = px.scatter(df_f, x=x, y=y, color=color, size=size, trendline=None if trend == "none" else trend,
-                     hover_data=["Sexo", "Estrato", "Nomofobia?" ] if "Nomofobia?" in df_f.columns else None,
-                     title=f"{y} vs {x}")
-    st.plotly_chart(fig, use_container_width=True)
-    st.caption("Usa zoom y selección para investigar puntos atípicos; filtra por la barra lateral para subgrupos.")
+@section
+def explorer_a(df_f):
+    st.subheader("6) Explorador A — análisis bivariado avanzado")
+    with st.expander("Abrir Explorador A (scatter, trendline, color)"):
+        numeric = [c for c in df_f.columns if is_numeric_dtype(df_f[c])]
+        cat = [c for c in df_f.columns if not is_numeric_dtype(df_f[c])]
+        x = st.selectbox("Eje X (num)", numeric, index=0)
+        y = st.selectbox("Eje Y (num)", numeric, index=1)
+        color = st.selectbox("Color por (categórico)", [None] + cat, index=1 if cat else 0)
+        size = st.selectbox("Tamaño por (num, opcional)", [None] + numeric, index=0)
+        trend = st.selectbox("Trendline", ["none", "ols", "lowess"], index=1)
+        fig = rendering.scatter_figure(df_f, x=x, y=y, color=color, size=size, trendline=None if trend == "none" else trend,
+                                       hover_data=["Sexo", "Estrato", "Nomofobia?" ] if "Nomofobia?" in df_f.columns else None,
+                                       title=f"{y} vs {x}", partition=group_partition(color))
+        show_chart(fig, len(df_f))
+        st.caption("Usa zoom y selección para investigar puntos atípicos; filtra por la barra lateral para subgrupos.")
 
-st.markdown("---")
+    st.markdown("---")
 
 # -------------------- Explorador B (comparador correlaciones) --------------------
-st.subheader("7) Explorador B — comparador de correlaciones (Spearman personalizado)")
-with st.expander("Abrir Explorador B (Spearman)"):
-    cand = [c for c in spearman_vars if c in df_f.columns]
-    v1 = st.selectbox("Variable A", cand, index=0, key="c1")
-    v2 = st.selectbox("Variable B", cand, index=1, key="c2")
-    if v1 == v2:
-        st.warning("Selecciona dos variables distintas.")
-    else:
-        rho, p = stats.spearmanr(df_f[v1], df_f[v2], nan_policy="omit")
-        st.write(f"Spearman ρ = {rho:.3f}  •  p = {p:.4f}")
-        fig_sc = px.scatter(df_f, x=v1, y=v2, color="Nomofobia?" if "Nomofobia?" in df_f.columns else None, trendline="ols",
-                            title=f"{v2} vs {v1}")
-        st.plotly_chart(fig_sc, use_container_width=True)
-        if p < 0.05:
-            st.success("Correlación estadísticamente significativa.")
+@section
+def explorer_b(df_f, spearman_vars):
+    st.subheader("7) Explorador B — comparador de correlaciones (Spearman personalizado)")
+    with st.expander("Abrir Explorador B (Spearman)"):
+        cand = [c for c in spearman_vars if c in df_f.columns]
+        v1 = st.selectbox("Variable A", cand, index=0, key="c1")
+        v2 = st.selectbox("Variable B", cand, index=1, key="c2")
+        if v1 == v2:
+            st.warning("Selecciona dos variables distintas.")
         else:
-            st.info("No significativa (p ≥ 0.05).")
-        if len(df_f.dropna(subset=[v1, v2])) > 50:
-            st.plotly_chart(px.density_contour(df_f, x=v1, y=v2), use_container_width=True)
+            rho, p, _ = cached(analysis.spearman_pair, v1, v2)
+            st.write(f"Spearman ρ = {rho:.3f}  •  p = {p:.4f}")
+            color = "Nomofobia?" if "Nomofobia?" in df_f.columns else None
+            fig_sc = rendering.scatter_figure(df_f, x=v1, y=v2, color=color, trendline="ols",
+                                              title=f"{v2} vs {v1}", partition=group_partition(color))
+            show_chart(fig_sc, len(df_f))
+            if p < 0.05:
+                st.success("Correlación estadísticamente significativa.")
+            else:
+                st.info("No significativa (p ≥ 0.05).")
+            if len(df_f.dropna(subset=[v1, v2])) > 50:
+                show_chart(rendering.density_contour_figure(df_f, v1, v2), len(df_f))
 
-st.markdown("---")
+    st.markdown("---")
 
 # -------------------- Explorador C (nuevo): Comparador por grupos categóricos --------------------
-st.subheader("8) Explorador C — Comparador por grupos categóricos (tablas + gráficos)")
-
-with st.expander("Abrir Explorador C (comparar medias/medianas por grupo)"):
-    # Selección de variables
-    cat_var = st.selectbox(
-        "Variable categórica para agrupar",
-        [c for c in ["Estrato", "Sexo", "Nomofobia?"] if c in df_f.columns]
-    )
-
-    numeric_cols = [c for c in df_f.columns if np.issubdtype(df_f[c].dtype, np.number)]
-    num_var = st.selectbox("Variable numérica a comparar", numeric_cols, index=0)
-
-    # Tabla resumen
-    st.write(f"Resumen por **{cat_var}** — variable **{num_var}**:")
-    grp = df_f.groupby(cat_var)[num_var].agg(["count", "mean", "median", "std"]).reset_index()
-    st.dataframe(grp, use_container_width=True)  # <- corregido: sin formato flotante
-
-    # Boxplot
-    fig_box = px.box(
-        df_f,
-        x=cat_var,
-        y=num_var,
-        points="all",
-        color=cat_var,
-        title=f"{num_var} por {cat_var}"
-    )
-    st.plotly_chart(fig_box, use_container_width=True, key=f"boxplot_{cat_var}_{num_var}")
-
-    # Kruskal–Wallis si hay más de 2 grupos
-    uniques = df_f[cat_var].dropna().unique()
-    if len(uniques) > 2:
-        groups_list = [g[num_var].dropna() for _, g in df_f.groupby(cat_var)]
-        try:
-            Hc, p_hc = stats.kruskal(*groups_list)
-            st.write(f"Kruskal–Wallis: H = {Hc:.3f} • p = {p_hc:.4f}")
-            if p_hc < 0.05:
-                st.success("Diferencias estadísticamente significativas entre grupos (p < 0.05).")
-            else:
-                st.info("No se encontraron diferencias significativas entre grupos.")
-        except Exception as e:
-            st.error(f"No se pudo ejecutar Kruskal–Wallis: {e}")
-    else:
-        st.info("Kruskal–Wallis no aplica (menos de 3 grupos).")
+ADJUST_LABELS = {"bonferroni": "Bonferroni", "holm": "Holm", "fdr_bh": "Benjamini–Hochberg"}
 
-st.markdown("---")
+@section
+def explorer_c(df_f):
+    st.subheader("8) Explorador C — Comparador por grupos categóricos (tablas + gráficos)")
 
-# -------------------- CONCLUSIONES AMPLIADAS y RECOMENDACIONES --------------------
-st.header("Conclusiones")
-
-# Formar conclusiones por test
-conclusions = []
-
-# Spearman summary (Horas_Uso pairs)
-if "Horas_Uso" in df_f.columns:
-    for v in ["Nomofobia", "Ansiedad_social", "Autoestima"]:
-        if v in df_f.columns:
-            rho, p = stats.spearmanr(df_f["Horas_Uso"], df_f[v], nan_policy="omit")
-            if np.isnan(rho):
-                continue
-            text = f"Horas_Uso vs {v}: ρ={rho:.3f}, p={p:.4f}."
-            if p < 0.05:
-                text += " Asociación estadísticamente significativa."
-            else:
-                text += " No asociación significativa."
-            conclusions.append(text)
-
-# Mann-Whitney conclusion
-if 'p_u' in locals():
-    conclusions.append(f"Mann–Whitney (Horas_Uso | Nomofobia): p={p_u:.4f}. {'Diferencia significativa entre grupos' if p_u<0.05 else 'Sin diferencia estadísticamente significativa'}.")
-
-# Kruskal conclusion
-if 'p_kw' in locals():
-    conclusions.append(f"Kruskal–Wallis (Nomofobia ~ Estrato): p={p_kw:.4f}. {'Se detectaron diferencias entre estratos' if p_kw<0.05 else 'No se evidenciaron diferencias entre estratos'}.")
-
-# Dunn highlights (significant pairs)
-if {"Estrato", "Nomofobia"}.issubset(df_f.columns):
-    sig_pairs = []
-    d = dunn.copy()
-    for i in d.index:
-        for j in d.columns:
-            if i == j: continue
+    with st.expander("Abrir Explorador C (comparar medias/medianas por grupo)"):
+        # Selección de variables
+        cat_var = st.selectbox(
+            "Variable categórica para agrupar",
+            [c for c in ["Estrato", "Sexo", "Nomofobia?"] if c in df_f.columns]
+        )
+
+        numeric_cols = [c for c in df_f.columns if is_numeric_dtype(df_f[c])]
+        num_var = st.selectbox("Variable numérica a comparar", numeric_cols, index=0)
+
+        # Tabla resumen
+        st.write(f"Resumen por **{cat_var}** — variable **{num_var}**:")
+        grp = cached(analysis.group_summary, cat_var, num_var, partition_by=cat_var)
+        st.dataframe(grp, use_container_width=True)  # <- corregido: sin formato flotante
+
+        # Boxplot
+        fig_box = rendering.box_figure(
+            df_f,
+            cat_var,
+            num_var,
+            color=cat_var,
+            title=f"{num_var} por {cat_var}",
+            partition=group_partition(cat_var),
+        )
+        show_chart(fig_box, len(df_f), key=f"boxplot_{cat_var}_{num_var}")
+
+        # Kruskal–Wallis si hay más de 2 grupos
+        uniques = df_f[cat_var].dropna().unique()
+        if len(uniques) > 2:
             try:
-                pv = d.loc[i, j]
-                if pv < 0.05:
-                    sig_pairs.append(f"{i} vs {j} (p={pv:.3f})")
-            except Exception:
-                pass
-    if sig_pairs:
-        conclusions.append("Dunn post-hoc: pares significativos -> " + "; ".join(sig_pairs))
-    else:
-        conclusions.append("Dunn post-hoc: no se detectaron pares con p<0.05.")
-
-# Print conclusions
-st.markdown("**Resumen de hallazgos (detallado):**")
-for c in conclusions:
-    st.write("• " + c)
-
-# Actionable recommendations (prioritized)
-st.markdown("**Recomendaciones accionables (priorizadas):**")
-recs = []
-# Example priority rules
-if any("Ansiedad_social" in s and "significativa" in s for s in conclusions):
-    recs.append("Priorizar intervenciones dirigidas a estudiantes con alta ansiedad social para reducir la exposición al smartphone.")
-if 'p_u' in locals() and p_u < 0.05:
-    recs.append("Diseñar campañas de reducción de tiempo de pantalla y talleres de autocontrol para grupos con nomofobia.")
-recs.append("Realizar estudios longitudinales para evaluar causalidad y modelos multivariados que controlen confusores.")
-for i, r in enumerate(recs, 1):
-    st.write(f"{i}. {r}")
+                kc = cached(analysis.kruskal, value=num_var, group=cat_var, partition_by=cat_var, p_method=p_method)
+                Hc, p_hc = kc["H"], kc["p"]
+                st.write(f"Kruskal–Wallis: H = {Hc:.3f} • p = {p_hc:.4f}")
+                if p_hc < 0.05:
+                    st.success("Diferencias estadísticamente significativas entre grupos (p < 0.05).")
+                else:
+                    st.info("No se encontraron diferencias significativas entre grupos.")
+            except Exception as e:
+                st.error(f"No se pudo ejecutar Kruskal–Wallis: {e}")
+        else:
+            st.info("Kruskal–Wallis no aplica (menos de 3 grupos).")
+
+        # Cribado: todas las combinaciones numérica × categórica de una vez
+        if screen_values and screen_groups:
+            st.markdown("**Cribado completo — Kruskal–Wallis y Dunn para todas las combinaciones**")
+            adjust = st.selectbox("Ajuste de Dunn por comparaciones múltiples", grouped_ranks.P_ADJUST,
+                                  format_func=ADJUST_LABELS.get, key="dunn_adjust")
+            scr = cached(grouped_ranks.screen, screen_values, screen_groups, partition_by=screen_groups, p_adjust=adjust)
+            grid = scr["kruskal"].pivot(index="variable", columns="grupo", values="p")
+            st.write("p-valores de Kruskal–Wallis (filas: variable numérica; columnas: agrupación; * = p < 0.05):")
+            st.dataframe(grid.map(lambda p: "—" if np.isnan(p) else f"{p:.4f}" + (" *" if p < 0.05 else "")),
+                         use_container_width=True)
+            pairs = scr["dunn"].get((num_var, cat_var))
+            if pairs is not None:
+                st.write(f"Dunn ({ADJUST_LABELS[adjust]}) — **{num_var}** por **{cat_var}**:")
+                show_table(pairs, "%.4f")
+
+    st.markdown("---")
+
+
+section_descriptives(df_f, numeric_cols, selection)
+if show_normality:
+    section_normality(numeric_cols)
+section_spearman(spearman_vars, bootstrap_spearman, nboots, ci_method)
+section_mann_whitney(df_f)
+section_kruskal(df_f)
+section_dunn(df_f)
+explorer_a(df_f)
+explorer_b(df_f, spearman_vars)
+explorer_c(df_f)
+
+# -------------------- CONCLUSIONES AMPLIADAS y RECOMENDACIONES --------------------
+@section
+def section_conclusions(df_f):
+    st.header("Conclusiones")
+
+    # Resultados de cada prueba (ya calculados por las secciones) -> reglas del motor
+    pairs = {}
+    if "Horas_Uso" in spearman_vars:
+        # misma clave que la tabla de la sección 2: ρ y p salen de ahí
+        spearman_tbl = cached(analysis.spearman_table, "Horas_Uso", tuple(spearman_vars),
+                              bootstrap=bootstrap_spearman, n_boot=nboots, method=ci_method)
+        pairs = analysis.spearman_pairs(spearman_tbl, engine.CONCLUSION_VARS)
+    mw = cached(analysis.mann_whitney, partition_by="Nomofobia?", p_method=p_method) if {"Nomofobia?", "Horas_Uso"}.issubset(df_f.columns) else None
+    has_kw = {"Estrato", "Nomofobia"}.issubset(df_f.columns)
+    kw = cached(analysis.kruskal, partition_by="Estrato", p_method=p_method) if has_kw else None
+    dunn = cached(analysis.dunn, partition_by="Estrato") if has_kw else None
+    conclusions = engine.build_conclusions(pairs, mw, kw, dunn)
+
+    # Print conclusions
+    st.markdown("**Resumen de hallazgos (detallado):**")
+    for c in conclusions:
+        st.write("• " + c)
+
+    # Actionable recommendations (prioritized)
+    st.markdown("**Recomendaciones accionables (priorizadas):**")
+    recs = engine.build_recommendations(conclusions, mw)
+    for i, r in enumerate(recs, 1):
+        st.write(f"{i}. {r}")
+
+section_conclusions(df_f)
+
+profiler.end_script()
+
+# -------------------- Diagnóstico de rendimiento (barra lateral, opcional) --------------------
+# Fragmento que se refresca solo: así también muestra los reruns de fragmentos,
+# que no vuelven a ejecutar el final del script.
+@st.fragment(run_every=DIAGNOSTICS_REFRESH_S)
+def diagnostics():
+    st.subheader("Diagnóstico")
+    runs = profiler.table()
+    scope = "script completo" if profiler.run_label == "script" else f"fragmento {profiler.run_label}"
+    st.caption(f"Rerun #{profiler.run} ({scope}) • {runs['wall_s'][runs['depth'] == 0].sum():.2f} s medidos • "
+               f"caché global: {results_cache.hits} aciertos / {results_cache.misses} fallos")
+    mem = dataset.footprint(df_f, filter_rows)
+    st.caption(f"Dataset compartido: {mem['shared_mb']:.2f} MB • esta sesión: {mem['session_mb']:.2f} MB "
+               f"({len(df_f):,} de {dataset.n_rows:,} filas)")
+    view = runs.assign(name=["·" * d + n for d, n in zip(runs["depth"], runs["name"])],
+                       wall_ms=runs["wall_s"] * 1e3, cpu_ms=runs["cpu_s"] * 1e3)
+    show_table(view[["name", "wall_ms", "cpu_ms", "peak_mb", "rows", "cache_hits", "cache_misses"]],
+               {"wall_ms": "%.1f", "cpu_ms": "%.1f", "peak_mb": "%.1f"}, hide_index=True)
+    with st.expander("Acumulado de la sesión"):
+        st.dataframe(profiler.summary(), use_container_width=True)
+    st.download_button("Exportar trazas (JSON)", profiler.to_json(), file_name="trazas.json", mime="application/json")
+    st.download_button("Exportar Chrome trace", profiler.to_chrome_trace(), file_name="chrome_trace.json",
+                       mime="application/json", help="Abrir en chrome://tracing o ui.perfetto.dev")
+
+if show_diagnostics:
+    with diagnostics_panel:
+        diagnostics()
 
 st.info("Las conclusiones y recomendaciones están pensadas para guiar decisiones de intervención y futuras investigaciones.")
 st.caption("Dashboard nomofobia | Estadística No Paramétrica | Johann Rivera & Julian Valderrama | 2025")
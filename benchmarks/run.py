@@ -0,0 +1,232 @@
+# benchmarks/run.py — Tiempos y memoria por etapa del pipeline a distintos tamaños
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Uso (desde la raíz del repositorio):
+#   python -m benchmarks.run                      # 1k y 100k filas, compara con baselines.json
+#   python -m benchmarks.run --sizes 1000 100000 1000000
+#   python -m benchmarks.run --update-baselines   # guarda los resultados como nueva referencia
+#   python -m benchmarks.run --sizes              # sólo el arranque en frío
+#   python -m benchmarks.run --strict             # falla aunque la máquina no sea la de referencia
+#
+# Cada etapa (carga, filtro, descriptivas directas, por streaming del archivo y
+# por celdas desde el DataFrame cargado como el dashboard, normalidad,
+# bootstrap de Spearman, Mann–Whitney, Kruskal, Dunn, cribado de todas las
+# combinaciones, construcción de figuras) se mide por separado: tiempo de reloj y pico de memoria asignada
+# (tracemalloc).
+#
+# Los tiempos de referencia son de una máquina concreta. Antes de comparar se
+# corre una calibración fija (numpy, pandas y Python puro) y los tiempos
+# guardados se escalan por cociente calibración actual / calibración de
+# referencia. Si una etapa supera su referencia por más de la tolerancia, el
+# script termina con código 1 cuando corre en la máquina de referencia (o con
+# --strict); en otra máquina sólo avisa.
+# Además mide el arranque en frío del dashboard (benchmarks/startup.py): portada
+# y primer render en procesos nuevos, guardado bajo la clave "startup". Esos
+# tiempos se escalan con su propia calibración (un proceso nuevo que importa
+# numpy y pandas), porque dependen del disco y de la importación de módulos
+# más que de la CPU.
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+import analysis
+import rendering
+from data_loader import CATEGORICAL_COLS, load_dataset
+from engine import NUMERIC_COLS, SPEARMAN_VARS
+from filters import FILTER_COLS, CategoricalIndex
+from grouped_ranks import screen
+from streaming import frame_descriptives, stream_descriptives
+from benchmarks.startup import calibrate_startup, measure_startup
+from benchmarks.synthetic import write_survey
+
+BASELINES = Path(__file__).with_name("baselines.json")
+DEFAULT_SIZES = [1_000, 100_000]
+TIME_TOLERANCE = 1.5
+MEMORY_TOLERANCE = 1.5
+TIME_SLACK = 0.05  # s; evita falsos positivos en etapas de milisegundos
+MEMORY_SLACK = 1.0  # MB
+WARMUP_SIZE = 200
+CALIBRATION_KEY = "_calibration"
+STARTUP_KEY = "startup"
+CALIBRATION_REPEATS = 5
+
+
+def measure(fn):
+    """(resultado, segundos, pico de MB) de fn()."""
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    t0 = time.perf_counter()
+    try:
+        out = fn()
+        elapsed = time.perf_counter() - t0
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+    return out, elapsed, peak
+
+
+def _calibration_workload():
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(0)
+    x = rng.random(1_000_000)
+    np.sort(x)
+    pd.DataFrame({"g": rng.integers(0, 100, 1_000_000), "x": x}).groupby("g")["x"].agg(["mean", "median"])
+    sum(i * i for i in range(300_000))
+
+
+def calibrate(repeats=CALIBRATION_REPEATS):
+    """Mínimo de `repeats` corridas de una carga fija: la vara con la que se escalan los tiempos."""
+    _calibration_workload()
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        _calibration_workload()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def machine_info():
+    import numpy as np
+    import pandas as pd
+
+    return {"machine": platform.machine(), "processor": platform.processor(), "cpus": os.cpu_count(),
+            "python": platform.python_version(), "numpy": np.__version__, "pandas": pd.__version__}
+
+
+def build_figures(df):
+    figs = [rendering.histogram_figure(df, "Horas_Uso"),
+            rendering.violin_figure(df, "Estrato", "Nomofobia", title="violin"),
+            rendering.box_figure(df, "Estrato", "Nomofobia", color="Estrato", title="box"),
+            rendering.scatter_figure(df, "Horas_Uso", "Nomofobia", color="Nomofobia?", trendline="ols", title="scatter")]
+    # serializar como lo hace st.plotly_chart
+    return sum(len(f.to_json()) for f in figs)
+
+
+def run_size(n, workdir, n_boot, verbose=True):
+    src = write_survey(Path(workdir) / f"encuesta_{n}.csv", n)
+    cache_dir = Path(workdir) / f"cache_{n}"
+    stages = {}
+
+    def stage(name, fn):
+        out, sec, mb = measure(fn)
+        stages[name] = {"seconds": round(sec, 4), "peak_mb": round(mb, 2)}
+        if verbose:
+            print(f"  {name:<20} {sec:9.3f} s  {mb:9.1f} MB", flush=True)
+        return out
+
+    if verbose:
+        print(f"n = {n:,}")
+    stage("load_cold", lambda: load_dataset(src, cache_dir=cache_dir))
+    df = stage("load_warm", lambda: load_dataset(src, cache_dir=cache_dir))
+    index = stage("filter_index", lambda: CategoricalIndex(df))
+    selection = {"Sexo": ["Mujer"], "Estrato": ["2", "3", "4", "5"], "Nomofobia?": ["Sí", "No"]}
+    rows = stage("filter", lambda: index.rows(selection))
+    df_f = df.iloc[rows]
+    stage("describe", lambda: analysis.describe(df_f, NUMERIC_COLS))
+    stage("describe_streaming", lambda: stream_descriptives(src, NUMERIC_COLS, by=FILTER_COLS).table(selection))
+    stage("describe_cells", lambda: frame_descriptives(df, NUMERIC_COLS, by=FILTER_COLS).table(selection))
+    stage("normality", lambda: analysis.normality_table(df_f, NUMERIC_COLS))
+    stage("spearman_bootstrap", lambda: analysis.spearman_table(df_f, "Horas_Uso", SPEARMAN_VARS, n_boot=n_boot))
+    stage("mann_whitney", lambda: analysis.mann_whitney(df_f, partition=index.partition("Nomofobia?", rows)))
+    stage("kruskal", lambda: analysis.kruskal(df_f, partition=index.partition("Estrato", rows)))
+    stage("dunn", lambda: analysis.dunn(df_f))
+    stage("screening", lambda: screen(df_f, SPEARMAN_VARS, CATEGORICAL_COLS))
+    stage("figures", lambda: build_figures(df_f))
+    return stages
+
+
+def compare(results, baselines, scale=1.0, startup_scale=1.0):
+    """Lista de regresiones (texto) frente a las referencias guardadas.
+
+    `scale` multiplica los tiempos de referencia (calibración actual / de
+    referencia); `startup_scale`, los de la clave "startup".
+    """
+    failures = []
+    for size, stages in results.items():
+        if size == CALIBRATION_KEY:
+            continue
+        base = baselines.get(size, {})
+        factor = startup_scale if size == STARTUP_KEY else scale
+        for name, cur in stages.items():
+            ref = base.get(name)
+            if ref is None:
+                continue
+            ref_s = ref["seconds"] * factor
+            if cur["seconds"] > ref_s * TIME_TOLERANCE + TIME_SLACK:
+                failures.append(f"n={size} {name}: {cur['seconds']:.3f} s (referencia escalada {ref_s:.3f} s)")
+            if cur["peak_mb"] > ref["peak_mb"] * MEMORY_TOLERANCE + MEMORY_SLACK:
+                failures.append(f"n={size} {name}: {cur['peak_mb']:.1f} MB (referencia {ref['peak_mb']:.1f} MB)")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark por etapas del dashboard de nomofobia.")
+    parser.add_argument("--sizes", type=int, nargs="*", default=DEFAULT_SIZES, help="Tamaños de muestra")
+    parser.add_argument("--boots", type=int, default=1000, help="Remuestreos del bootstrap de Spearman")
+    parser.add_argument("--update-baselines", action="store_true", help="Guardar los resultados como referencia")
+    parser.add_argument("--output", default=None, help="Guardar los resultados en este JSON")
+    parser.add_argument("--no-startup", action="store_true", help="Omitir la medición de arranque en frío")
+    parser.add_argument("--strict", action="store_true",
+                        help="Terminar con código 1 ante regresiones aunque la máquina no sea la de referencia")
+    args = parser.parse_args(argv)
+
+    calibration = {"seconds": round(calibrate(), 4), "machine": machine_info()}
+    print(f"calibración {calibration['seconds']:.3f} s")
+    results = {}
+    if args.sizes:
+        with tempfile.TemporaryDirectory() as workdir:
+            # calentamiento: importaciones perezosas y primeras llamadas no cuentan
+            run_size(WARMUP_SIZE, workdir, 50, verbose=False)
+            results = {str(n): run_size(n, workdir, args.boots) for n in args.sizes}
+    if not args.no_startup:
+        calibration["startup_seconds"] = round(calibrate_startup(), 4)
+        print(f"arranque (calibración {calibration['startup_seconds']:.3f} s)")
+        results[STARTUP_KEY] = measure_startup()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    baselines = json.loads(BASELINES.read_text()) if BASELINES.exists() else {}
+    if args.update_baselines:
+        baselines.update(results)
+        # conserva la calibración de arranque si esta corrida no midió el arranque
+        startup_ref = baselines.get(CALIBRATION_KEY, {}).get("startup_seconds")
+        baselines[CALIBRATION_KEY] = dict(calibration)
+        if "startup_seconds" not in calibration and startup_ref is not None:
+            baselines[CALIBRATION_KEY]["startup_seconds"] = startup_ref
+        BASELINES.write_text(json.dumps(baselines, indent=2) + "\n")
+        print(f"Referencias actualizadas en {BASELINES}")
+        return 0
+
+    reference = baselines.get(CALIBRATION_KEY)
+    scale = calibration["seconds"] / reference["seconds"] if reference else 1.0
+    startup_scale = 1.0
+    if reference and "startup_seconds" in calibration and reference.get("startup_seconds"):
+        startup_scale = calibration["startup_seconds"] / reference["startup_seconds"]
+    same_machine = reference is not None and reference["machine"] == calibration["machine"]
+    if reference:
+        print(f"tiempos de referencia escalados x{scale:.2f} (arranque x{startup_scale:.2f})"
+              + ("" if same_machine else " (otra máquina: las regresiones sólo se avisan, salvo --strict)"))
+    failures = compare(results, baselines, scale, startup_scale)
+    if failures:
+        gate = same_machine or args.strict
+        print("\n*** REGRESIÓN DE RENDIMIENTO ***" if gate else "\nAviso: posibles regresiones (otra máquina)",
+              file=sys.stderr)
+        for f in failures:
+            print("  " + f, file=sys.stderr)
+        return 1 if gate else 0
+    print("\nSin regresiones frente a las referencias." if baselines else "\nSin referencias guardadas (usa --update-baselines).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
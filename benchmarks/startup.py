@@ -0,0 +1,86 @@
+# benchmarks/startup.py — Arranque en frío: portada y primer render del dashboard
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Cada medición corre en un proceso nuevo (como un contenedor recién escalado):
+#   import_streamlit  importar streamlit
+#   landing           primer render de app.py hasta la portada ("Iniciar Análisis")
+#   dashboard         primer render completo de una sesión que ya pasó la portada
+# Se guarda el mínimo de varias repeticiones; peak_mb es el RSS máximo del
+# proceso hijo (VmHWM de /proc, no tracemalloc), comparable sólo consigo mismo.
+# `modules` lista cuáles de HEAVY_MODULES quedaron importados en cada etapa.
+#
+# Estos tiempos los dominan la importación de módulos (disco, bytecode) y el
+# arranque del intérprete, no el cómputo que mide la calibración de
+# benchmarks/run.py. Por eso tienen su propia vara, calibrate_startup(): un
+# proceso nuevo que sólo importa numpy y pandas, con la que run.py escala las
+# referencias de "startup".
+#
+# Uso: python -m benchmarks.startup   (también lo ejecuta benchmarks.run)
+
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+APP = ROOT / "app.py"
+TARGETS = ("import_streamlit", "landing", "dashboard")
+DEFAULT_REPEATS = 3
+HEAVY_MODULES = ("scipy", "matplotlib", "statsmodels", "pyarrow")
+
+
+def _child(target):
+    t0 = time.perf_counter()
+    from streamlit.testing.v1 import AppTest
+    elapsed = time.perf_counter() - t0
+    if target != "import_streamlit":
+        at = AppTest.from_file(str(APP), default_timeout=600)
+        if target == "dashboard":
+            at.session_state["show_dashboard"] = True
+        t0 = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - t0
+        if at.exception:
+            raise SystemExit(f"{target}: {at.exception[0].value}")
+    # ru_maxrss hereda el pico del proceso padre; VmHWM se reinicia con exec
+    status = Path("/proc/self/status")
+    hwm = [l for l in status.read_text().splitlines() if l.startswith("VmHWM")] if status.exists() else []
+    peak = int(hwm[0].split()[1]) / 1024 if hwm else float("nan")
+    modules = [m for m in HEAVY_MODULES if m in sys.modules]
+    print(json.dumps({"seconds": round(elapsed, 4), "peak_mb": round(peak, 1), "modules": modules}))
+
+
+def calibrate_startup(repeats=DEFAULT_REPEATS):
+    """Mínimo de `repeats` procesos nuevos que importan numpy y pandas (segundos, medido desde el padre)."""
+    best = float("inf")
+    for _ in range(repeats):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, "-c", "import numpy, pandas"], cwd=ROOT, check=True)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def measure_startup(repeats=DEFAULT_REPEATS, verbose=True):
+    """{etapa: {"seconds", "peak_mb"}} con el mínimo de `repeats` procesos nuevos."""
+    stages = {}
+    for target in TARGETS:
+        runs = []
+        for _ in range(repeats):
+            out = subprocess.run([sys.executable, "-W", "ignore", "-m", "benchmarks.startup", "--child", target],
+                                 cwd=ROOT, capture_output=True, text=True, check=True)
+            runs.append(json.loads(out.stdout.strip().splitlines()[-1]))
+        stages[target] = {"seconds": min(r["seconds"] for r in runs), "peak_mb": min(r["peak_mb"] for r in runs),
+                          "modules": runs[-1]["modules"]}
+        if verbose:
+            print(f"  {target:<20} {stages[target]['seconds']:9.3f} s  {stages[target]['peak_mb']:9.1f} MB  "
+                  f"{', '.join(stages[target]['modules']) or '-'}", flush=True)
+    return stages
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--child":
+        _child(sys.argv[2])
+    else:
+        print("arranque")
+        measure_startup()
@@ -0,0 +1,53 @@
+# benchmarks/synthetic.py — Generador de encuestas sintéticas con el esquema de DATOS REALES.xlsx
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Reproduce columnas, tipos y la estructura de correlaciones de los datos
+# reales (más horas de uso -> más nomofobia, ansiedad social y mal uso, menos
+# autoestima; puntajes Likert promediados de 1 a 5) a cualquier tamaño.
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ["ID", "Edad", "Sexo", "Estrato", "Horas_Uso", "Nomofobia?", "Nomofobia",
+           "Ansiedad_social", "Autoestima", "Mal_uso"]
+
+
+def _likert(latent, items, rng):
+    """Promedio de `items` ítems Likert 1–5 alrededor de un puntaje latente."""
+    raw = latent[:, None] + rng.normal(0, 0.6, (len(latent), items))
+    return np.clip(np.rint(raw), 1, 5).mean(axis=1)
+
+
+def make_survey(n, seed=0):
+    """DataFrame crudo (como sale de pd.read_excel) con `n` encuestados."""
+    rng = np.random.default_rng(seed)
+    estrato = rng.choice([1, 2, 3, 4, 5, 6], n, p=[0.05, 0.15, 0.25, 0.25, 0.2, 0.1])
+    edad = np.clip(np.rint(rng.normal(32 - 1.5 * estrato, 5)), 16, 60).astype(int)
+    horas = np.clip(np.round(1.2 * estrato + rng.normal(1.5, 1.2, n), 1), 0.5, 16)
+    dep = (horas - 6.5) / 2.2 + rng.normal(0, 0.4, n)
+    nomofobia = _likert(3.4 + 0.9 * dep, 30, rng)
+    return pd.DataFrame({
+        "ID": np.arange(1, n + 1),
+        "Edad": edad,
+        "Sexo": rng.choice(["Mujer", "Hombre"], n, p=[0.65, 0.35]),
+        "Estrato": estrato,
+        "Horas_Uso": horas,
+        "Nomofobia?": np.where(nomofobia >= 4, "Sí", "No"),
+        "Nomofobia": nomofobia,
+        "Ansiedad_social": _likert(3.2 + 0.5 * dep, 5, rng),
+        "Autoestima": _likert(2.9 - 0.3 * dep, 6, rng),
+        "Mal_uso": _likert(3.4 + 0.8 * dep, 5, rng),
+    }, columns=COLUMNS)
+
+
+def write_survey(path, n, seed=0):
+    """Escribe la encuesta en CSV o Excel según la extensión de `path`."""
+    path = Path(path)
+    df = make_survey(n, seed=seed)
+    if path.suffix.lower() == ".csv":
+        df.to_csv(path, index=False)
+    else:
+        df.to_excel(path, index=False)
+    return path
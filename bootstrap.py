@@ -0,0 +1,262 @@
+# bootstrap.py — Bootstrap vectorizado para intervalos de confianza de Spearman
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# En lugar de llamar stats.spearmanr B veces, se generan todos los índices de
+# remuestreo como una matriz (por bloques acotados en memoria) y los rangos de
+# cada remuestra se obtienen sin ordenar: como los valores remuestreados salen
+# del mismo conjunto original, basta contar cuántas veces aparece cada valor
+# único (bincount) y acumular para obtener los rangos medios (empates incluidos).
+#
+# Las columnas de la encuesta tienen pocos valores distintos: cuando los pares
+# (x, y) distintos son pocos frente a n, una remuestra es un vector de conteos
+# multinomial sobre esos U pares y ρ sale de rangos ponderados, con costo
+# O(B·U) en lugar de O(B·n) y el mismo resultado que expandir las filas. Con
+# datos casi continuos se usan índices de fila. El jackknife se hace igual,
+# restando a los conteos las filas de cada grupo eliminado.
+
+import numpy as np
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+MAX_JACKKNIFE_GROUPS = 500
+# pares distintos / n por debajo del cual se remuestrea sobre pares con pesos
+MAX_UNIQUE_FRACTION = 0.5
+
+
+def _dense_codes(a):
+    """Códigos 0..U-1 según el orden de los valores únicos de `a`."""
+    uniques, codes = np.unique(a, return_inverse=True)
+    return codes.reshape(-1), len(uniques)
+
+
+def _resampled_ranks(codes, n_unique, idx):
+    """Rangos medios de cada fila de remuestreo `idx` (b, m) sin ordenar."""
+    b = idx.shape[0]
+    c = codes[idx]
+    counts = np.bincount((c + n_unique * np.arange(b)[:, None]).ravel(),
+                         minlength=b * n_unique).reshape(b, n_unique)
+    mid = np.cumsum(counts, axis=1) - (counts - 1) / 2.0
+    return np.take_along_axis(mid, c, axis=1)
+
+
+def _rank_corr(rx, ry, m):
+    """Correlación de Pearson fila a fila entre matrices de rangos (b, m)."""
+    # la media de los rangos medios siempre es (m+1)/2
+    dx = rx - (m + 1) / 2.0
+    dy = ry - (m + 1) / 2.0
+    num = np.einsum("ij,ij->i", dx, dy)
+    den = np.sqrt(np.einsum("ij,ij->i", dx, dx) * np.einsum("ij,ij->i", dy, dy))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return num / den
+
+
+def _unique_pairs(x_codes, ux, y_codes, uy, return_inverse=False):
+    """Pares (x, y) distintos: códigos de x y de y por par, frecuencias (y el par de cada fila)."""
+    out = np.unique(x_codes.astype(np.int64) * uy + y_codes, return_inverse=return_inverse, return_counts=True)
+    pairs, counts = out[0], out[-1]
+    if return_inverse:
+        return pairs // uy, pairs % uy, counts, out[1].reshape(-1)
+    return pairs // uy, pairs % uy, counts
+
+
+def _weighted_ranks(codes, n_unique, W):
+    """Rangos medios (b, U) de cada par cuando la fila i de W da cuántas veces aparece cada par."""
+    b = W.shape[0]
+    counts = np.bincount((codes + n_unique * np.arange(b)[:, None]).ravel(), weights=W.ravel(),
+                         minlength=b * n_unique).reshape(b, n_unique)
+    mid = np.cumsum(counts, axis=1) - (counts - 1) / 2.0
+    return mid[:, codes]
+
+
+def _weighted_corr(xc, ux, yc, uy, W):
+    """ρ de Spearman por fila de W (conteos de cada par), igual al de las filas expandidas."""
+    centre = (W.sum(axis=1, keepdims=True) + 1) / 2.0
+    dx = _weighted_ranks(xc, ux, W)
+    dx -= centre
+    dy = _weighted_ranks(yc, uy, W)
+    dy -= centre
+    w_d = W * dx
+    num = np.einsum("ij,ij->i", w_d, dy)
+    sxx = np.einsum("ij,ij->i", w_d, dx)
+    np.multiply(W, dy, out=w_d)
+    den = np.sqrt(sxx * np.einsum("ij,ij->i", w_d, dy))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return num / den
+
+
+def _compressible(pairs, n):
+    return len(pairs[2]) <= MAX_UNIQUE_FRACTION * n
+
+
+def _chunk_rows(m, k, max_bytes):
+    # índices + rangos de x + rangos de cada variable + temporales
+    per_row = m * 8 * (k + 4)
+    return max(1, int(max_bytes // per_row))
+
+
+def _weighted_chunk_rows(u, max_bytes):
+    # conteos (enteros y float) + rangos de x e y + W·d + temporales de indexar
+    return max(1, int(max_bytes // (u * 8 * 7)))
+
+
+def _correlations(x_codes, ux, y_codes, idx):
+    m = idx.shape[1]
+    rx = _resampled_ranks(x_codes, ux, idx)
+    out = np.empty((idx.shape[0], len(y_codes)))
+    for j, (codes, u) in enumerate(y_codes):
+        out[:, j] = _rank_corr(rx, _resampled_ranks(codes, u, idx), m)
+    return out
+
+
+def bootstrap_spearman(x, Y, n_boot=1000, seed=12345, max_bytes=DEFAULT_MAX_BYTES):
+    """Matriz (n_boot, k) de ρ de Spearman remuestreados de `x` contra cada columna de `Y`.
+
+    `x` tiene forma (n,) y `Y` forma (n,) o (n, k), sin NaN. Las columnas con
+    pocos pares (x, y) distintos se remuestrean sobre esos pares (conteos
+    multinomiales, cada una con sus remuestras); las demás comparten los mismos
+    índices de fila.
+    """
+    x = np.asarray(x)
+    Y = np.asarray(Y)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    n, k = Y.shape
+    x_codes, ux = _dense_codes(x)
+    # códigos por fila sólo de las columnas que van por índices de fila
+    by_rows, y_codes, pairs = [], [], {}
+    for j in range(k):
+        codes = _dense_codes(Y[:, j])
+        p = _unique_pairs(x_codes, ux, *codes)
+        if _compressible(p, n):
+            pairs[j] = (*p, codes[1])
+        else:
+            by_rows.append(j)
+            y_codes.append(codes)
+
+    rng = np.random.default_rng(seed)
+    boots = np.empty((n_boot, k))
+    if by_rows:
+        chunk = _chunk_rows(n, len(by_rows), max_bytes)
+        for start in range(0, n_boot, chunk):
+            b = min(chunk, n_boot - start)
+            idx = rng.integers(0, n, (b, n))
+            boots[start:start + b, by_rows] = _correlations(x_codes, ux, y_codes, idx)
+    for j, (xc, yc, freq, uy) in pairs.items():
+        chunk = _weighted_chunk_rows(len(freq), max_bytes)
+        for start in range(0, n_boot, chunk):
+            b = min(chunk, n_boot - start)
+            W = rng.multinomial(n, freq / n, size=b).astype(float)
+            boots[start:start + b, j] = _weighted_corr(xc, ux, yc, uy, W)
+    return boots
+
+
+def jackknife_spearman(x, Y, max_groups=MAX_JACKKNIFE_GROUPS, max_bytes=DEFAULT_MAX_BYTES):
+    """Réplicas jackknife (g, k) de ρ; con n grande se usa jackknife por grupos (g ≤ max_groups)."""
+    x = np.asarray(x)
+    Y = np.asarray(Y)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    n, k = Y.shape
+    g = min(n, max_groups)
+    x_codes, ux = _dense_codes(x)
+
+    # cada réplica elimina un grupo contiguo de observaciones (tamaños casi iguales)
+    bounds = np.linspace(0, n, g + 1).astype(int)
+    keep_len = n - np.diff(bounds)
+    out = np.empty((g, k))
+    group = np.repeat(np.arange(g), np.diff(bounds))
+    by_rows, y_codes = [], []
+    for j in range(k):
+        codes = _dense_codes(Y[:, j])
+        pairs = _unique_pairs(x_codes, ux, *codes, return_inverse=True)
+        if not _compressible(pairs, n):
+            by_rows.append(j)
+            y_codes.append(codes)
+        else:
+            # conteos de cada par sin las filas de cada grupo
+            xc, yc, freq, inverse = pairs
+            u = len(freq)
+            chunk = _weighted_chunk_rows(u, max_bytes)
+            for s in range(0, g, chunk):
+                sel = slice(s, min(g, s + chunk))
+                rows = (group >= sel.start) & (group < sel.stop)
+                removed = np.bincount((group[rows] - sel.start) * u + inverse[rows],
+                                      minlength=(sel.stop - sel.start) * u).reshape(-1, u)
+                out[sel, j] = _weighted_corr(xc, ux, yc, codes[1], (freq - removed).astype(float))
+    if not by_rows:
+        return out
+    for m in np.unique(keep_len):
+        groups = np.flatnonzero(keep_len == m)
+        chunk = _chunk_rows(m, len(by_rows), max_bytes)
+        for s in range(0, len(groups), chunk):
+            sel = groups[s:s + chunk]
+            # fila i: índices 0..n-1 sin el bloque [bounds[i], bounds[i+1])
+            pos = np.arange(m)[None, :]
+            idx = pos + (pos >= bounds[sel][:, None]) * (n - m)
+            out[np.ix_(sel, by_rows)] = _correlations(x_codes, ux, y_codes, idx)
+    return out
+
+
+def spearman_ci(x, Y, n_boot=1000, ci=0.95, method="percentile", seed=12345,
+                max_bytes=DEFAULT_MAX_BYTES):
+    """Intervalos bootstrap (lo, hi) de ρ para cada columna de `Y`.
+
+    method: "percentile" (como la versión original) o "bca" (corregido por
+    sesgo y acelerado, con aceleración estimada por jackknife).
+    """
+    Y = np.asarray(Y)
+    if Y.ndim == 1:
+        Y = Y[:, None]
+    boots = bootstrap_spearman(x, Y, n_boot=n_boot, seed=seed, max_bytes=max_bytes)
+    alpha = (1 - ci) / 2
+    if method == "percentile":
+        lo = np.nanpercentile(boots, 100 * alpha, axis=0)
+        hi = np.nanpercentile(boots, 100 * (1 - alpha), axis=0)
+        return lo, hi
+    if method != "bca":
+        raise ValueError(f"Método de intervalo no soportado: {method}")
+
+    from scipy import stats
+    theta = np.array([stats.spearmanr(x, Y[:, j]).correlation for j in range(Y.shape[1])])
+    jack = jackknife_spearman(x, Y, max_bytes=max_bytes)
+    lo = np.full(Y.shape[1], np.nan)
+    hi = np.full(Y.shape[1], np.nan)
+    for j in range(Y.shape[1]):
+        b = boots[:, j][~np.isnan(boots[:, j])]
+        if len(b) == 0 or np.isnan(theta[j]):
+            continue
+        prop = np.clip(np.mean(b < theta[j]), 1 / (len(b) + 1), len(b) / (len(b) + 1))
+        z0 = stats.norm.ppf(prop)
+        d = np.nanmean(jack[:, j]) - jack[:, j]
+        den = 6.0 * np.nansum(d ** 2) ** 1.5
+        a = np.nansum(d ** 3) / den if den > 0 else 0.0
+        z = stats.norm.ppf([alpha, 1 - alpha])
+        adj = stats.norm.cdf(z0 + (z0 + z) / (1 - a * (z0 + z)))
+        lo[j], hi[j] = np.percentile(b, 100 * adj)
+    return lo, hi
+
+
+def spearman_ci_by_column(df, target, variables, n_boot=1000, ci=0.95, method="percentile",
+                          seed=12345, min_n=10, max_bytes=DEFAULT_MAX_BYTES):
+    """Intervalos de ρ(target, v) para cada v de `variables` (casos completos por par).
+
+    Las variables con el mismo patrón de NaN respecto a `target` se procesan en
+    un solo lote. Devuelve {variable: (lo, hi)}; las que tienen menos de
+    `min_n` pares completos no aparecen.
+    """
+    valid_t = df[target].notna().to_numpy()
+    batches = {}
+    for v in variables:
+        mask = valid_t & df[v].notna().to_numpy()
+        if mask.sum() < min_n:
+            continue
+        batches.setdefault(mask.tobytes(), (mask, []))[1].append(v)
+
+    result = {}
+    for mask, cols in batches.values():
+        x = df[target].to_numpy()[mask]
+        Y = df[cols].to_numpy(dtype=float)[mask]
+        lo, hi = spearman_ci(x, Y, n_boot=n_boot, ci=ci, method=method, seed=seed,
+                             max_bytes=max_bytes)
+        for j, v in enumerate(cols):
+            result[v] = (lo[j], hi[j])
+    return result
@@ -0,0 +1,62 @@
+# cli.py — Análisis en lote desde la línea de comandos (sin navegador)
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Uso:
+#   python cli.py DIRECTORIO --out resultados/ [--workers 8] [--boots 1000]
+#                 [--ci percentile|bca] [--permutation] [--no-normality] [--no-bootstrap]
+#                 [--group-by Sexo] [--format json|parquet|csv]
+#
+# Por cada archivo (.xlsx/.xls/.csv) escribe <archivo>.json (p. ej. w1.xlsx.json)
+# con todos los resultados, y al final una tabla resumen (archivo, prueba, estadístico, p).
+
+import argparse
+import sys
+import time
+
+import engine
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Análisis no paramétrico de nomofobia en lote.")
+    parser.add_argument("directory", help="Directorio con libros Excel o CSV")
+    parser.add_argument("--out", default="resultados", help="Directorio de salida (por defecto: resultados)")
+    parser.add_argument("--workers", type=int, default=None, help="Procesos en paralelo (por defecto: núcleos)")
+    parser.add_argument("--boots", type=int, default=1000, help="Remuestreos bootstrap para los IC de Spearman")
+    parser.add_argument("--ci", choices=["percentile", "bca"], default="percentile", help="Tipo de intervalo bootstrap")
+    parser.add_argument("--permutation", action="store_true",
+                        help="P-valores por permutación para Mann–Whitney y Kruskal–Wallis "
+                             "(hasta 5000 observaciones; por encima, asintóticos)")
+    parser.add_argument("--no-normality", action="store_true", help="Omitir Shapiro-Wilk / Anderson-Darling")
+    parser.add_argument("--no-bootstrap", action="store_true", help="Omitir los IC bootstrap")
+    parser.add_argument("--group-by", default=None, help="Analizar cada cohorte de esta columna por separado")
+    parser.add_argument("--format", choices=["parquet", "csv", "json"], default="parquet",
+                        help="Formato de la tabla resumen (por defecto: parquet)")
+    args = parser.parse_args(argv)
+
+    sources = engine.find_sources(args.directory)
+    if not sources:
+        print(f"No se encontraron archivos .xlsx/.xls/.csv en {args.directory}", file=sys.stderr)
+        return 1
+
+    t0 = time.perf_counter()
+    summary, errors = engine.analyze_directory(
+        args.directory, args.out, workers=args.workers, group_by=args.group_by,
+        normality=not args.no_normality, bootstrap=not args.no_bootstrap,
+        n_boot=args.boots, ci_method=args.ci, p_method="permutation" if args.permutation else "asymptotic",
+    )
+    out = f"{args.out}/resumen.{args.format}"
+    if args.format == "parquet":
+        summary.to_parquet(out, index=False)
+    elif args.format == "csv":
+        summary.to_csv(out, index=False)
+    else:
+        summary.to_json(out, orient="records", force_ascii=False, indent=2)
+
+    print(f"{len(sources) - len(errors)}/{len(sources)} archivos analizados en {time.perf_counter() - t0:.1f} s -> {out}")
+    for name, err in errors.items():
+        print(f"  error en {name}: {err}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
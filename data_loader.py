@@ -0,0 +1,198 @@
+# data_loader.py — Carga de datos con caché columnar (Arrow) para el dashboard
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# El libro Excel se parsea una sola vez; el resultado limpio y compacto se
+# guarda como "sidecar" Arrow IPC (sin comprimir) junto a una huella (mtime +
+# tamaño + SHA-256) del archivo fuente. Mientras la huella no cambie, las
+# recargas mapean el archivo en memoria: las columnas numéricas del DataFrame
+# apuntan directamente a esas páginas (cero copias, sólo lectura, compartidas
+# por el sistema operativo entre procesos).
+#
+# Representación compacta (compact_dataframe): Sexo, Estrato y Nomofobia? como
+# `category` (códigos int8 + un diccionario de niveles) y cada columna numérica
+# con el tipo más chico que no pierde información (enteros int8/int16, float32
+# sólo si el valor se conserva exacto; los puntajes promediados quedan float64).
+#
+# Memoria por sesión: el DataFrame se comparte entre todas las sesiones
+# (st.cache_resource) y se trata como inmutable. Cada sesión guarda las
+# posiciones de sus filas filtradas (int64, 8 B/fila) y, si el filtro deja
+# fuera alguna fila, una copia compacta de esas filas (SharedDataset.select)
+# que los fragmentos mantienen viva entre reruns; sin filtros no hay copia.
+# Esa copia es deliberada: pandas, scipy y plotly necesitan columnas
+# contiguas, así que pasarles sólo las posiciones haría que cada prueba y cada
+# gráfico juntara las mismas filas por su cuenta en cada rerun. Las
+# particiones por grupo sí salen de las posiciones (filters.CategoricalIndex).
+# El panel de diagnóstico muestra ambas cifras (SharedDataset.footprint).
+
+import hashlib
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_PATH = Path("DATOS REALES.xlsx")
+CACHE_DIR = Path(".data_cache")
+
+CATEGORICAL_COLS = ["Sexo", "Estrato", "Nomofobia?"]
+NUMERIC_COLS = ["Horas_Uso", "Nomofobia", "Ansiedad_social", "Autoestima", "Edad", "Mal_uso"]
+
+# (ruta, mtime_ns, tamaño) -> sha256; evita re-hashear el archivo en cada rerun
+_HASHES = {}
+# prefijo del sha256 en el nombre del sidecar
+DIGEST_GLOB = "[0-9a-f]" * 16
+
+
+def clean_dataframe(df):
+    """Limpieza mínima: nombres de columna, categóricas como texto y numéricas coaccionadas."""
+    df = df.copy()
+    df.columns = df.columns.str.strip()
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype(str).str.strip()
+    for col in NUMERIC_COLS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+    return df
+
+
+def compact_dataframe(df):
+    """Categóricas como `category` y numéricas con el menor tipo sin pérdida."""
+    df = df.copy()
+    for col in CATEGORICAL_COLS:
+        if col in df.columns:
+            df[col] = df[col].astype("category")
+    for col in df.columns:
+        s = df[col]
+        if pd.api.types.is_integer_dtype(s):
+            df[col] = pd.to_numeric(s, downcast="integer")
+        elif pd.api.types.is_float_dtype(s):
+            v = s.to_numpy(dtype=float)
+            if np.array_equal(v.astype(np.float32).astype(float), v, equal_nan=True):
+                df[col] = s.astype(np.float32)
+    return df
+
+
+def read_source(path):
+    """Lee el archivo fuente (Excel o CSV) sin caché."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        return pd.read_csv(path)
+    return pd.read_excel(path)
+
+
+def file_fingerprint(path):
+    """Huella del archivo fuente: (mtime_ns, tamaño, sha256)."""
+    path = Path(path)
+    st_ = path.stat()
+    key = (str(path.resolve()), st_.st_mtime_ns, st_.st_size)
+    digest = _HASHES.get(key)
+    if digest is None:
+        h = hashlib.sha256()
+        with open(path, "rb") as fh:
+            for block in iter(lambda: fh.read(1 << 20), b""):
+                h.update(block)
+        digest = h.hexdigest()
+        _HASHES[key] = digest
+    return st_.st_mtime_ns, st_.st_size, digest
+
+
+def sidecar_path(path, digest, cache_dir=CACHE_DIR):
+    """Ruta del sidecar Arrow asociado a una versión concreta del archivo fuente."""
+    return Path(cache_dir) / f"{Path(path).name}.{digest[:16]}.arrow"
+
+
+def write_sidecar(df, path):
+    """Escribe `df` (compacto) como Arrow IPC sin comprimir; NaN se guarda como valor, no como nulo."""
+    import pyarrow as pa
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, col in enumerate(df.columns):
+        if pd.api.types.is_float_dtype(df[col]):
+            # from_pandas convierte NaN en nulo y to_pandas tendría que copiar para rellenarlo
+            table = table.set_column(i, col, pa.array(df[col].to_numpy(), from_pandas=False))
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def read_sidecar(path):
+    """DataFrame sobre el sidecar mapeado en memoria (numéricas sin copia)."""
+    import pyarrow as pa
+
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    return table.to_pandas(split_blocks=True, zero_copy_only=False)
+
+
+def remove_stale_sidecars(path, current):
+    """Borra las otras versiones del sidecar de `path`, también las nombradas por el stem
+    (Parquet y Arrow antiguos); exigir la huella hexadecimal evita tocar las de otros archivos."""
+    name, stem = Path(path).name, Path(path).stem
+    stale = [f"{name}.{DIGEST_GLOB}.arrow", f"{stem}.{DIGEST_GLOB}.arrow", f"{stem}.{DIGEST_GLOB}.parquet"]
+    for old in [p for pattern in stale for p in Path(current).parent.glob(pattern)]:
+        if old != current:
+            old.unlink(missing_ok=True)
+
+
+def load_dataset(path=DATA_PATH, cache_dir=CACHE_DIR):
+    """Devuelve el DataFrame limpio y compacto, usando el sidecar Arrow si está vigente.
+
+    Si pyarrow no está disponible o el directorio no es escribible, se parsea
+    el archivo fuente y se continúa sin sidecar.
+    """
+    _, _, digest = file_fingerprint(path)
+    cached = sidecar_path(path, digest, cache_dir)
+    if cached.exists():
+        try:
+            df = read_sidecar(cached)
+        except (ImportError, OSError, ValueError):
+            pass
+        else:
+            try:
+                remove_stale_sidecars(path, cached)
+            except OSError:
+                pass
+            return df
+
+    df = compact_dataframe(clean_dataframe(read_source(path)))
+    try:
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        remove_stale_sidecars(path, cached)
+        tmp = cached.with_suffix(f".{os.getpid()}.tmp")
+        write_sidecar(df, tmp)
+        tmp.replace(cached)
+        # servir desde el mapa de memoria también en la primera carga
+        return read_sidecar(cached)
+    except (ImportError, OSError, ValueError):
+        pass
+    return df
+
+
+class SharedDataset:
+    """DataFrame compartido e inmutable + selección de filas por sesión.
+
+    `frame` no se modifica nunca; `select(rows)` devuelve el mismo objeto si
+    la selección cubre todas las filas y, si no, una copia compacta de esas filas
+    sin los niveles que quedan vacíos (los gráficos y pruebas no ven grupos vacíos).
+    La copia es por sesión, no sólo posiciones: ver la cabecera del módulo.
+    """
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.n_rows = len(frame)
+        self.categorical = [c for c in frame.columns if isinstance(frame[c].dtype, pd.CategoricalDtype)]
+        self.nbytes = int(frame.memory_usage(deep=True).sum())
+
+    def select(self, rows):
+        if len(rows) == self.n_rows:
+            return self.frame
+        sub = self.frame.take(rows)
+        for col in self.categorical:
+            sub[col] = sub[col].cat.remove_unused_categories()
+        return sub
+
+    def footprint(self, view, rows):
+        """{"shared_mb", "session_mb"}: memoria compartida y la que agrega una sesión con esta selección."""
+        session = np.asarray(rows).nbytes
+        if view is not self.frame:
+            session += int(view.memory_usage(deep=True).sum())
+        return {"shared_mb": self.nbytes / 1e6, "session_mb": session / 1e6}
@@ -0,0 +1,199 @@
+# engine.py — Motor de análisis sin interfaz (mismo pipeline que el dashboard)
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Reúne las pruebas de analysis.py y las reglas de conclusiones y
+# recomendaciones en un único resultado estructurado; cli.py lo ejecuta en
+# lote sobre directorios de libros Excel o CSV. El dashboard comparte con este
+# módulo las columnas y las reglas de conclusiones, pero pide cada prueba a
+# analysis.py por separado (caché por filtro y por sección).
+
+import json
+import math
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import analysis
+from data_loader import CATEGORICAL_COLS, clean_dataframe, read_source
+from grouped_ranks import screen
+
+NUMERIC_COLS = ["Horas_Uso", "Nomofobia", "Ansiedad_social", "Autoestima", "Mal_uso"]
+SPEARMAN_VARS = ["Horas_Uso", "Nomofobia", "Ansiedad_social", "Autoestima", "Mal_uso", "Edad"]
+CONCLUSION_VARS = ["Nomofobia", "Ansiedad_social", "Autoestima"]
+SOURCE_PATTERNS = ("*.xlsx", "*.xls", "*.csv")
+
+
+# -------------------- Reglas de conclusiones y recomendaciones --------------------
+def build_conclusions(spearman_pairs, mw, kw, dunn):
+    """Textos de hallazgos a partir de los resultados de cada prueba.
+
+    spearman_pairs: {variable: (rho, p)} de Horas_Uso contra cada variable.
+    mw / kw: dicts de analysis.mann_whitney / analysis.kruskal (o None).
+    dunn: matriz de p-valores ajustados (o None).
+    """
+    conclusions = []
+    for v, (rho, p) in spearman_pairs.items():
+        if np.isnan(rho):
+            continue
+        text = f"Horas_Uso vs {v}: ρ={rho:.3f}, p={p:.4f}."
+        if p < 0.05:
+            text += " Asociación estadísticamente significativa."
+        else:
+            text += " No asociación significativa."
+        conclusions.append(text)
+
+    if mw is not None:
+        p_u = mw["p"]
+        conclusions.append(f"Mann–Whitney (Horas_Uso | Nomofobia): p={p_u:.4f}. {'Diferencia significativa entre grupos' if p_u<0.05 else 'Sin diferencia estadísticamente significativa'}.")
+
+    if kw is not None:
+        p_kw = kw["p"]
+        conclusions.append(f"Kruskal–Wallis (Nomofobia ~ Estrato): p={p_kw:.4f}. {'Se detectaron diferencias entre estratos' if p_kw<0.05 else 'No se evidenciaron diferencias entre estratos'}.")
+
+    if dunn is not None:
+        sig_pairs = []
+        for i in dunn.index:
+            for j in dunn.columns:
+                if i == j:
+                    continue
+                pv = dunn.loc[i, j]
+                if pv < 0.05:
+                    sig_pairs.append(f"{i} vs {j} (p={pv:.3f})")
+        if sig_pairs:
+            conclusions.append("Dunn post-hoc: pares significativos -> " + "; ".join(sig_pairs))
+        else:
+            conclusions.append("Dunn post-hoc: no se detectaron pares con p<0.05.")
+    return conclusions
+
+
+def build_recommendations(conclusions, mw):
+    """Recomendaciones accionables priorizadas."""
+    recs = []
+    if any("Ansiedad_social" in s and "significativa" in s for s in conclusions):
+        recs.append("Priorizar intervenciones dirigidas a estudiantes con alta ansiedad social para reducir la exposición al smartphone.")
+    if mw is not None and mw["p"] < 0.05:
+        recs.append("Diseñar campañas de reducción de tiempo de pantalla y talleres de autocontrol para grupos con nomofobia.")
+    recs.append("Realizar estudios longitudinales para evaluar causalidad y modelos multivariados que controlen confusores.")
+    return recs
+
+
+# -------------------- Pipeline completo --------------------
+def analyze(df, normality=True, bootstrap=True, n_boot=1000, ci_method="percentile", p_method="asymptotic"):
+    """Ejecuta todas las pruebas del dashboard sobre `df` (ya limpio) y devuelve un dict."""
+    numeric_cols = [c for c in NUMERIC_COLS if c in df.columns]
+    spearman_vars = [c for c in SPEARMAN_VARS if c in df.columns]
+    res = {"n": len(df)}
+    res["descriptives"] = analysis.describe(df, numeric_cols) if numeric_cols else None
+    res["normality"] = analysis.normality_table(df, numeric_cols, qq_points=0) if normality else None
+
+    res["spearman_matrix"] = res["spearman_table"] = None
+    if len(spearman_vars) >= 2:
+        target = "Horas_Uso" if "Horas_Uso" in spearman_vars else spearman_vars[0]
+        res["spearman_matrix"] = analysis.spearman_matrix(df, spearman_vars)
+        res["spearman_table"] = analysis.spearman_table(df, target, spearman_vars, bootstrap=bootstrap,
+                                                        n_boot=n_boot, method=ci_method)
+
+    pairs = {}
+    if "Horas_Uso" in spearman_vars and res["spearman_table"] is not None:
+        pairs = analysis.spearman_pairs(res["spearman_table"], CONCLUSION_VARS)
+
+    has_mw = {"Nomofobia?", "Horas_Uso"}.issubset(df.columns)
+    has_kw = {"Estrato", "Nomofobia"}.issubset(df.columns)
+    res["mann_whitney"] = analysis.mann_whitney(df, p_method=p_method) if has_mw else None
+    res["kruskal"] = analysis.kruskal(df, p_method=p_method) if has_kw else None
+    res["dunn"] = analysis.dunn(df) if has_kw else None
+    # Kruskal–Wallis de todas las combinaciones numérica × categórica
+    groups = [c for c in CATEGORICAL_COLS if c in df.columns]
+    res["screening"] = screen(df, spearman_vars, groups)["kruskal"] if spearman_vars and groups else None
+
+    res["conclusions"] = build_conclusions(pairs, res["mann_whitney"], res["kruskal"], res["dunn"])
+    res["recommendations"] = build_recommendations(res["conclusions"], res["mann_whitney"])
+    return res
+
+
+def to_jsonable(obj):
+    """Convierte resultados (DataFrames, arrays, escalares numpy, NaN) a tipos JSON."""
+    if isinstance(obj, pd.DataFrame):
+        return {"index": [to_jsonable(i) for i in obj.index], "columns": [to_jsonable(c) for c in obj.columns],
+                "data": to_jsonable(obj.to_numpy().tolist())}
+    if isinstance(obj, dict):
+        return {str(k): to_jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple, np.ndarray)):
+        return [to_jsonable(v) for v in obj]
+    if isinstance(obj, np.generic):
+        obj = obj.item()
+    if isinstance(obj, float) and not math.isfinite(obj):
+        return None
+    return obj
+
+
+def summary_rows(name, res):
+    """Filas planas (archivo, prueba, estadístico, p) para la tabla resumen del lote."""
+    rows = []
+    mw, kw = res.get("mann_whitney"), res.get("kruskal")
+    if mw is not None:
+        rows.append({"source": name, "test": "mann_whitney", "statistic": mw["U"], "p": mw["p"], "effect": mw["r"]})
+    if kw is not None:
+        rows.append({"source": name, "test": "kruskal", "statistic": kw["H"], "p": kw["p"], "effect": np.nan})
+    tbl = res.get("spearman_table")
+    if tbl is not None:
+        for r in tbl.itertuples(index=False):
+            rows.append({"source": name, "test": f"spearman_{r.variable}", "statistic": r.rho, "p": r.p, "effect": np.nan})
+    for r in rows:
+        r["n"] = res["n"]
+    return rows
+
+
+# -------------------- Lotes --------------------
+def find_sources(directory):
+    directory = Path(directory)
+    return sorted(p for pattern in SOURCE_PATTERNS for p in directory.glob(pattern) if not p.name.startswith("~$"))
+
+
+def analyze_file(path, out_dir, group_by=None, **options):
+    """Analiza un archivo (y cada cohorte de `group_by`), escribe su JSON y devuelve filas resumen.
+
+    Salida y columna `source` usan el nombre con extensión (w1.xlsx y w1.csv no chocan).
+    """
+    path = Path(path)
+    df = clean_dataframe(read_source(path))
+    cohorts = [(path.name, df)]
+    if group_by:
+        cohorts = [(f"{path.name}[{group_by}={level}]", g) for level, g in df.groupby(group_by)]
+    out = {}
+    rows = []
+    for name, part in cohorts:
+        res = analyze(part, **options)
+        out[name] = to_jsonable(res)
+        rows.extend(summary_rows(name, res))
+    with open(Path(out_dir) / f"{path.name}.json", "w", encoding="utf-8") as fh:
+        json.dump(out, fh, ensure_ascii=False, indent=2)
+    return rows
+
+
+def analyze_directory(directory, out_dir, workers=None, group_by=None, **options):
+    """Analiza todos los archivos de `directory` en paralelo (un proceso por archivo).
+
+    Devuelve (DataFrame resumen, {archivo: error}).
+    """
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    sources = find_sources(directory)
+    rows, errors = [], {}
+    if workers == 1:
+        for path in sources:
+            try:
+                rows.extend(analyze_file(path, out_dir, group_by=group_by, **options))
+            except Exception as e:
+                errors[path.name] = str(e)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(analyze_file, path, out_dir, group_by=group_by, **options): path for path in sources}
+            for fut, path in futures.items():
+                try:
+                    rows.extend(fut.result())
+                except Exception as e:
+                    errors[path.name] = str(e)
+    return pd.DataFrame(rows, columns=["source", "test", "statistic", "p", "effect", "n"]), errors
@@ -0,0 +1,102 @@
+# executor.py — Ejecución en paralelo de las pruebas estadísticas independientes
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Normalidad, Spearman + bootstrap, Mann–Whitney, Kruskal–Wallis y Dunn no
+# dependen entre sí: apenas se conoce df_f se envían todas a un pool y cada
+# sección espera sólo su propio resultado. Los resultados terminados se guardan
+# en la ResultsCache, así que una prueba que excede su tiempo límite igual
+# queda disponible para el siguiente rerun. Si el pool no está disponible se
+# calcula en serie, como antes.
+
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import BrokenExecutor, TimeoutError as FuturesTimeout
+
+DEFAULT_TIMEOUT = 60.0
+MODES = ("thread", "process", "serial")
+
+
+class SectionTimeout(Exception):
+    """Una prueba enviada al pool no terminó dentro de su tiempo límite."""
+
+    def __init__(self, key, timeout):
+        super().__init__(f"La prueba {key[1] if len(key) > 1 else key} superó {timeout:g} s")
+        self.key = key
+        self.timeout = timeout
+
+
+class SectionExecutor:
+    def __init__(self, cache, mode="thread", max_workers=None, timeout=DEFAULT_TIMEOUT):
+        if mode not in MODES:
+            raise ValueError(f"Modo de ejecución no soportado: {mode}")
+        self.cache = cache
+        self.mode = mode
+        self.timeout = timeout
+        self._pool = None
+        if mode == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="seccion")
+        elif mode == "process":
+            self._pool = ProcessPoolExecutor(max_workers=max_workers)
+        self._pending = {}
+        self._timeouts = {}
+        self._lock = threading.Lock()
+
+    @property
+    def parallel(self):
+        return self._pool is not None
+
+    def _fall_back(self):
+        """Pasa a modo serie (pool roto o cerrado); las tareas pendientes se recalculan al pedirlas."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+            self._pending.clear()
+            self.mode = "serial"
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _done(self, key, future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+                self._timeouts.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    def submit(self, key, fn, *args, timeout=None, **kwargs):
+        """Encola fn(*args, **kwargs) bajo `key` si no está ya en caché ni en curso."""
+        if not self.parallel or key in self.cache:
+            return
+        with self._lock:
+            if key in self._pending:
+                return
+            try:
+                future = self._pool.submit(fn, *args, **kwargs)
+            except (RuntimeError, BrokenExecutor):
+                future = None
+            else:
+                self._pending[key] = future
+                self._timeouts[key] = self.timeout if timeout is None else timeout
+        if future is None:
+            self._fall_back()
+            return
+        future.add_done_callback(lambda f: self._done(key, f))
+
+    def get(self, key, fn, *args, **kwargs):
+        """Resultado de `key`: de la caché, del pool (esperando su tiempo límite) o calculado en serie."""
+        def compute():
+            with self._lock:
+                future = self._pending.get(key)
+                timeout = self._timeouts.get(key, self.timeout)
+            if future is not None:
+                try:
+                    return future.result(timeout=timeout)
+                except FuturesTimeout:
+                    raise SectionTimeout(key, timeout) from None
+                except BrokenExecutor:
+                    self._fall_back()
+            return fn(*args, **kwargs)
+
+        return self.cache.get_or_compute(key, compute)
+
+    def shutdown(self):
+        self._fall_back()
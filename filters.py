@@ -0,0 +1,68 @@
+# filters.py — Índice categórico para los filtros de la barra lateral
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Las columnas categóricas se codifican una sola vez como enteros y para cada
+# nivel se guarda un bitmap empaquetado (1 bit por fila). Una selección de
+# filtros se resuelve con OR (niveles de una columna) y AND (entre columnas)
+# sobre esos bitmaps; las particiones por grupo salen de los mismos códigos.
+
+import numpy as np
+import pandas as pd
+
+FILTER_COLS = ["Sexo", "Estrato", "Nomofobia?"]
+
+
+class CategoricalIndex:
+    def __init__(self, df, columns=FILTER_COLS):
+        self.n_rows = len(df)
+        self.columns = [c for c in columns if c in df.columns]
+        self.codes = {}
+        self.levels = {}
+        self.bitmaps = {}
+        self._group_order = {}
+        for col in self.columns:
+            # orden de primera aparición, igual que Series.unique()
+            codes, uniques = pd.factorize(df[col])
+            self.codes[col] = codes.astype(np.int32)
+            self.levels[col] = list(uniques)
+            self.bitmaps[col] = {
+                level: np.packbits(codes == i) for i, level in enumerate(uniques)
+            }
+            # groupby ordena por categorías si la columna es `category` y por valor si no
+            if isinstance(df[col].dtype, pd.CategoricalDtype):
+                position = {c: i for i, c in enumerate(df[col].cat.categories)}
+                self._group_order[col] = sorted(range(len(uniques)), key=lambda i: position[uniques[i]])
+            else:
+                self._group_order[col] = sorted(range(len(uniques)), key=lambda i: uniques[i])
+        self._all = np.packbits(np.ones(self.n_rows, dtype=bool))
+
+    def options(self, col):
+        """Niveles disponibles de `col` (opciones del multiselect)."""
+        return list(self.levels.get(col, []))
+
+    def mask(self, selection):
+        """Bitmap empaquetado de las filas que cumplen {columna: niveles seleccionados}."""
+        out = self._all.copy()
+        for col, chosen in selection.items():
+            col_bits = np.zeros_like(out)
+            for level in chosen:
+                bits = self.bitmaps[col].get(level)
+                if bits is not None:
+                    np.bitwise_or(col_bits, bits, out=col_bits)
+            np.bitwise_and(out, col_bits, out=out)
+        return out
+
+    def rows(self, selection):
+        """Posiciones (enteros, ordenadas) de las filas seleccionadas."""
+        bits = np.unpackbits(self.mask(selection), count=self.n_rows)
+        return np.flatnonzero(bits)
+
+    def partition(self, col, rows=None):
+        """{nivel: posiciones relativas a `rows`} para los niveles presentes, ordenados como groupby."""
+        codes = self.codes[col] if rows is None else self.codes[col][rows]
+        order = np.argsort(codes, kind="stable")
+        # código -1 (valores faltantes) ocupa el primer bloque y se descarta
+        counts = np.bincount(codes + 1, minlength=len(self.levels[col]) + 1)
+        chunks = np.split(order, np.cumsum(counts)[:-1])
+        levels = self.levels[col]
+        return {levels[i]: chunks[i + 1] for i in self._group_order[col] if counts[i + 1] > 0}
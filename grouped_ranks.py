@@ -0,0 +1,146 @@
+# grouped_ranks.py — Kruskal–Wallis y Dunn para todas las combinaciones numérica × categórica
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Cada columna numérica se codifica una sola vez con pd.factorize (hash, O(n);
+# sólo los valores distintos se ordenan) y se cuenta en una única pasada
+# (np.bincount) contra la celda combinada de todas las columnas categóricas.
+# La tabla valor × nivel de cada categórica es un marginal de ese conteo, y de
+# ella salen los rangos medios (empates incluidos), las sumas de rangos por
+# grupo, H de Kruskal–Wallis y la matriz z/p de Dunn, con el mismo cálculo y la
+# misma corrección por empates que scipy.stats.kruskal y
+# scikit_posthocs.posthoc_dunn. Las filas sin valor o sin grupo quedan fuera
+# de esa combinación, como en las pruebas una a una.
+
+import numpy as np
+import pandas as pd
+
+P_ADJUST = ("bonferroni", "holm", "fdr_bh")
+MAX_BINS = 1 << 24
+
+
+def adjust_pvalues(p, method="bonferroni"):
+    """P-valores ajustados por comparaciones múltiples (bonferroni, holm, fdr_bh)."""
+    p = np.asarray(p, dtype=float)
+    m = len(p)
+    if m == 0 or method is None:
+        return p
+    if method == "bonferroni":
+        return np.minimum(p * m, 1.0)
+    order = np.argsort(p)
+    ranked = p[order]
+    if method == "holm":
+        adj = np.maximum.accumulate((m - np.arange(m)) * ranked)
+    elif method == "fdr_bh":
+        adj = np.minimum.accumulate((m / np.arange(1, m + 1) * ranked)[::-1])[::-1]
+    else:
+        raise ValueError(f"Método de ajuste no soportado: {method}")
+    out = np.empty(m)
+    out[order] = np.minimum(adj, 1.0)
+    return out
+
+
+def _value_codes(values):
+    """Códigos por valor distinto (−1 = NaN) y orden ascendente de esos valores."""
+    codes, uniques = pd.factorize(np.asarray(values, dtype=float), use_na_sentinel=True)
+    return codes, np.argsort(uniques, kind="stable")
+
+
+def _group_codes(series):
+    """Códigos con los faltantes en el último nivel (k) y niveles ordenados como en groupby."""
+    codes, levels = pd.factorize(series, sort=True, use_na_sentinel=True)
+    k = len(levels)
+    return np.where(codes < 0, k, codes), list(levels)
+
+
+def _partition_codes(partition, n):
+    """Como _group_codes, a partir de {nivel: posiciones} ya ordenado como groupby (filters.CategoricalIndex)."""
+    codes = np.full(n, len(partition), dtype=np.intp)
+    for i, pos in enumerate(partition.values()):
+        codes[pos] = i
+    return codes, list(partition)
+
+
+def _tables(vcodes, n_values, coded):
+    """{grupo: conteos (valores distintos × niveles + faltante)} en una pasada si cabe en MAX_BINS."""
+    sizes = [len(levels) + 1 for codes, levels in coded.values()]
+    valid = vcodes >= 0
+    if not valid.all():
+        vcodes = vcodes[valid]
+    cells = int(np.prod(sizes))
+    if n_values * cells <= MAX_BINS:
+        joint = vcodes.astype(np.int64) * cells
+        stride = cells
+        for (codes, _), size in zip(coded.values(), sizes):
+            stride //= size
+            joint += (codes if valid.all() else codes[valid]) * stride
+        full = np.bincount(joint, minlength=n_values * cells).reshape(n_values, *sizes)
+        axes = range(1, len(sizes) + 1)
+        return {g: full.sum(axis=tuple(a for a in axes if a != i)) for i, g in zip(axes, coded)}
+    out = {}
+    for g, (codes, levels) in coded.items():
+        size = len(levels) + 1
+        joint = vcodes.astype(np.int64) * size + (codes if valid.all() else codes[valid])
+        out[g] = np.bincount(joint, minlength=n_values * size).reshape(n_values, size)
+    return out
+
+
+def _from_table(table, levels, p_adjust, chi2, norm):
+    """H, p y matrices z / p ajustadas de Dunn a partir de la tabla valor (ordenado) × nivel."""
+    table = table[:, :len(levels)].astype(float)  # sin la columna de faltantes
+    per_value = table.sum(axis=1)
+    midrank = np.cumsum(per_value) - (per_value - 1) / 2
+    tie_sum = float((per_value ** 3 - per_value).sum())
+    n_g = table.sum(axis=0)
+    present = n_g > 0
+    r_g = (midrank @ table)[present]
+    n_g = n_g[present]
+    labels = [lv for lv, ok in zip(levels, present) if ok]
+    N = n_g.sum()
+    res = {"k": len(labels), "n": int(N), "H": np.nan, "p": np.nan, "z": None, "p_dunn": None}
+    if len(labels) < 2 or N < 2:
+        return res
+
+    tie_factor = 1 - tie_sum / (N ** 3 - N)
+    H = 12.0 / (N * (N + 1)) * (r_g ** 2 / n_g).sum() - 3 * (N + 1)
+    H = H / tie_factor if tie_factor > 0 else np.nan
+    res["H"], res["p"] = H, chi2.sf(H, len(labels) - 1)
+
+    mean_r = r_g / n_g
+    var = N * (N + 1) / 12 - tie_sum / (12 * (N - 1))
+    z = (mean_r[:, None] - mean_r[None, :]) / np.sqrt(var * (1 / n_g[:, None] + 1 / n_g[None, :]))
+    iu = np.triu_indices(len(labels), 1)
+    p = np.ones_like(z)
+    p[iu] = adjust_pvalues(2 * norm.sf(np.abs(z[iu])), p_adjust)
+    p.T[iu] = p[iu]
+    res["z"] = pd.DataFrame(z, index=labels, columns=labels)
+    res["p_dunn"] = pd.DataFrame(p, index=labels, columns=labels)
+    return res
+
+
+def screen(df, values, groups, p_adjust="bonferroni", partitions=None):
+    """Kruskal–Wallis + Dunn para cada (numérica, categórica).
+
+    partitions: {categórica: {nivel: posiciones}} opcional; esas columnas no se
+    vuelven a factorizar.
+    Devuelve {"kruskal": DataFrame (variable, grupo, k, n, H, p),
+              "dunn": {(variable, grupo): DataFrame de p ajustados},
+              "dunn_z": {(variable, grupo): DataFrame de z (fila − columna)}}.
+    """
+    from scipy.stats import chi2, norm
+
+    values = [v for v in values if v in df.columns]
+    partitions = partitions or {}
+    coded = {g: _partition_codes(partitions[g], len(df)) if g in partitions else _group_codes(df[g])
+             for g in groups if g in df.columns}
+    rows, dunn, dunn_z = [], {}, {}
+    for v in values:
+        vcodes, order = _value_codes(df[v].to_numpy(dtype=float))
+        tables = _tables(vcodes, len(order), coded) if coded else {}
+        for g, table in tables.items():
+            res = _from_table(table[order], coded[g][1], p_adjust, chi2, norm)
+            rows.append({"variable": v, "grupo": g, "k": res["k"], "n": res["n"], "H": res["H"], "p": res["p"]})
+            if res["p_dunn"] is not None:
+                dunn[(v, g)] = res["p_dunn"]
+                dunn_z[(v, g)] = res["z"]
+    return {"kruskal": pd.DataFrame(rows, columns=["variable", "grupo", "k", "n", "H", "p"]),
+            "dunn": dunn, "dunn_z": dunn_z}
@@ -0,0 +1,173 @@
+# instrumentation.py — Trazas de tiempo y memoria por sección del dashboard
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Cada sesión tiene un Profiler (en st.session_state). Las secciones, los
+# exploradores, las pruebas pedidas a la caché y los gráficos se envuelven en
+# `profiler.span(nombre)`, que registra tiempo de reloj, tiempo de CPU del hilo
+# del script, pico de memoria asignada (tracemalloc, opcional porque frena el
+# cálculo), filas procesadas y aciertos/fallos de caché. Los spans se anidan:
+# la traza se exporta como JSON plano o en formato Chrome trace (chrome://tracing,
+# Perfetto) para ver qué bloque domina un rerun lento.
+#
+# tracemalloc es global al proceso: sólo corre mientras alguna sesión con la
+# medición activa tiene abierto un span de primer nivel (cada span raíz toma y
+# suelta una referencia), así que una pestaña cerrada no lo deja encendido para
+# todo el servidor. Con varias sesiones midiendo a la vez, el pico de un span
+# incluye lo que asignen los demás hilos en ese intervalo.
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+MAX_RECORDS = 5000
+
+_memory_lock = threading.Lock()
+_memory_users = 0
+
+
+def _set_memory_tracking(on):
+    """Cuenta los spans raíz que miden memoria; tracemalloc corre mientras haya alguno."""
+    global _memory_users
+    with _memory_lock:
+        _memory_users = max(0, _memory_users + (1 if on else -1))
+        if _memory_users and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        elif not _memory_users and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+
+class Span:
+    __slots__ = ("name", "run", "depth", "start", "wall", "cpu", "peak_mb", "rows",
+                 "hits", "misses", "tid", "args", "_mem0", "_peak_abs")
+
+    def __init__(self, name, run, depth, rows, args):
+        self.name = name
+        self.run = run
+        self.depth = depth
+        self.rows = rows
+        self.args = args
+        self.hits = self.misses = 0
+        self.tid = threading.get_ident()
+        self.wall = self.cpu = 0.0
+        self.peak_mb = None
+        self._mem0 = self._peak_abs = 0
+
+    def as_dict(self):
+        return {"name": self.name, "run": self.run, "depth": self.depth, "start": self.start,
+                "wall_s": self.wall, "cpu_s": self.cpu, "peak_mb": self.peak_mb, "rows": self.rows,
+                "cache_hits": self.hits, "cache_misses": self.misses, **self.args}
+
+
+class Profiler:
+    """Registro de spans de una sesión (los últimos MAX_RECORDS)."""
+
+    def __init__(self, maxlen=MAX_RECORDS):
+        self.records = deque(maxlen=maxlen)
+        self.run = 0
+        self.run_label = None
+        self.in_script = False
+        self._stack = []
+        self._track_memory = False
+        self._origin = time.perf_counter()
+
+    @property
+    def track_memory(self):
+        return self._track_memory
+
+    @track_memory.setter
+    def track_memory(self, on):
+        self._track_memory = bool(on)
+
+    def new_run(self, label="script"):
+        """Marca el inicio de un rerun: el script completo o un fragmento (`label`)."""
+        self.run += 1
+        self.run_label = label
+        self.in_script = label == "script"
+        self._stack.clear()
+
+    def end_script(self):
+        """Fin del rerun completo; lo que se mida después es de reruns de fragmentos."""
+        self.in_script = False
+
+    @contextmanager
+    def span(self, name, rows=None, **args):
+        s = Span(name, self.run, len(self._stack), rows, args)
+        # el span raíz enciende tracemalloc y lo suelta al cerrar (también ante excepciones)
+        owner = self._track_memory and not self._stack
+        if owner:
+            _set_memory_tracking(True)
+        memory = self._track_memory and tracemalloc.is_tracing()
+        if memory:
+            cur, peak = tracemalloc.get_traced_memory()
+            # el pico que lleva el span padre no se pierde al reiniciar el contador
+            if self._stack:
+                self._stack[-1]._peak_abs = max(self._stack[-1]._peak_abs, peak)
+            tracemalloc.reset_peak()
+            s._mem0 = s._peak_abs = cur
+        self._stack.append(s)
+        s.start = time.perf_counter() - self._origin
+        cpu0 = time.thread_time()
+        try:
+            yield s
+        finally:
+            s.wall = time.perf_counter() - self._origin - s.start
+            s.cpu = time.thread_time() - cpu0
+            if memory and tracemalloc.is_tracing():
+                peak = max(s._peak_abs, tracemalloc.get_traced_memory()[1])
+                s.peak_mb = (peak - s._mem0) / 1e6
+                if len(self._stack) > 1:
+                    self._stack[-2]._peak_abs = max(self._stack[-2]._peak_abs, peak)
+            if self._stack and self._stack[-1] is s:
+                self._stack.pop()
+            self.records.append(s)
+            if owner:
+                _set_memory_tracking(False)
+
+    def note_cache(self, hit):
+        """Suma un acierto/fallo de caché a todos los spans abiertos."""
+        for s in self._stack:
+            if hit:
+                s.hits += 1
+            else:
+                s.misses += 1
+
+    def table(self, run=None):
+        """Spans de un rerun (por defecto el último) como DataFrame, en orden de inicio."""
+        import pandas as pd
+        run = self.run if run is None else run
+        rows = [s.as_dict() for s in self.records if s.run == run]
+        cols = ["name", "depth", "start", "wall_s", "cpu_s", "peak_mb", "rows", "cache_hits", "cache_misses"]
+        if not rows:
+            return pd.DataFrame(columns=cols)
+        return pd.DataFrame(rows).sort_values("start")[cols].reset_index(drop=True)
+
+    def summary(self):
+        """Agregado por nombre de span sobre todos los reruns registrados."""
+        import pandas as pd
+        df = pd.DataFrame([s.as_dict() for s in self.records])
+        if df.empty:
+            return df
+        g = df.groupby("name")
+        out = pd.DataFrame({"calls": g.size(), "wall_mean_s": g["wall_s"].mean(),
+                            "wall_p95_s": g["wall_s"].quantile(0.95), "wall_max_s": g["wall_s"].max(),
+                            "cpu_mean_s": g["cpu_s"].mean(), "peak_mb_max": g["peak_mb"].max(),
+                            "cache_hits": g["cache_hits"].sum(), "cache_misses": g["cache_misses"].sum()})
+        return out.sort_values("wall_mean_s", ascending=False)
+
+    def to_json(self):
+        return json.dumps([s.as_dict() for s in self.records], default=str, indent=1)
+
+    def to_chrome_trace(self):
+        """Eventos completos ("ph": "X") en microsegundos, agrupados por hilo del script."""
+        pid = os.getpid()
+        events = []
+        for s in self.records:
+            events.append({"name": s.name, "ph": "X", "pid": pid, "tid": s.tid,
+                           "ts": s.start * 1e6, "dur": s.wall * 1e6,
+                           "args": {"run": s.run, "cpu_ms": s.cpu * 1e3, "peak_mb": s.peak_mb, "rows": s.rows,
+                                    "cache_hits": s.hits, "cache_misses": s.misses, **s.args}})
+        return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"}, default=str)
@@ -0,0 +1,152 @@
+# normality.py — Pruebas de normalidad y pares QQ para muchas columnas y N grande
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Cada columna se ordena una sola vez y de ese orden salen todas las pruebas y
+# los puntos del QQ-plot:
+#   - Anderson–Darling (media y desviación estimadas) vectorizado sobre las
+#     columnas con el mismo n, por bloques acotados en memoria; el p-valor
+#     usa las fórmulas de D'Agostino & Stephens (1986), válidas a cualquier n.
+#   - Shapiro–Wilk completo hasta SHAPIRO_MAX observaciones; por encima (donde
+#     ya no es fiable) sobre una submuestra estratificada por rango: una
+#     observación al azar de cada uno de SHAPIRO_MAX tramos consecutivos.
+#   - D'Agostino–Pearson K² (asimetría + curtosis) sobre la muestra completa,
+#     la alternativa para muestras grandes.
+#   - Pares (cuantil teórico, valor ordenado) para rendering.qq_figure: todos
+#     hasta QQ_FULL_N observaciones (el umbral de N grande de rendering.py) y,
+#     por encima, QQ_POINTS estadísticos de orden equiespaciados.
+
+from statistics import NormalDist
+
+import numpy as np
+
+SHAPIRO_MAX = 5000
+QQ_POINTS = 1000
+QQ_FULL_N = 5000  # = rendering.LARGE_N_THRESHOLD (no se importa: arrastraría plotly)
+MIN_N = 3
+MIN_N_DAGOSTINO = 20
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024  # bloque de trabajo de A² y K² (≈ 4 copias del bloque)
+
+# Anderson–Darling, caso normal con parámetros estimados (como scipy.stats.anderson)
+AD_SIGNIFICANCE = np.array([15.0, 10.0, 5.0, 2.5, 1.0])
+AD_CRITICAL = np.array([0.561, 0.631, 0.752, 0.873, 1.035])
+# fuera de la tabla de D'Agostino & Stephens la cuadrática de a ≥ 0.6 vuelve a
+# crecer (mínimo en a ≈ 153, p ≥ 1 desde a ≈ 306); en AD_P_ZERO el p ya es < 1e-23
+AD_P_ZERO = 10.0
+
+
+def sorted_columns(df, cols):
+    """{columna: valores no nulos ordenados (float64)}; una sola ordenación por columna."""
+    X = np.empty((len(cols), len(df)))
+    for row, c in zip(X, cols):
+        row[:] = df[c].to_numpy()
+    X.sort(axis=1)  # NaN quedan al final
+    return {col: row[:len(row) - int(np.isnan(row).sum())] for col, row in zip(cols, X)}
+
+
+def qq_pairs(sorted_values, max_points=QQ_POINTS, full_n=QQ_FULL_N):
+    """(cuantiles teóricos N(0,1), valores ordenados, pendiente, intercepto) como scipy.stats.probplot.
+
+    Posiciones de Filliben; con más de `full_n` valores se toman `max_points`
+    estadísticos de orden equiespaciados (incluidos los extremos) y la recta se
+    ajusta sobre ellos.
+    """
+    n = len(sorted_values)
+    if n < MIN_N:
+        return None
+    i = np.arange(1, n + 1)
+    if max_points and n > max(full_n, max_points):
+        i = np.unique(np.round(np.linspace(1, n, max_points)).astype(int))
+    m = (i - 0.3175) / (n + 0.365)
+    m[i == n] = 0.5 ** (1 / n)
+    m[i == 1] = 1 - 0.5 ** (1 / n)
+    osm = np.array([NormalDist().inv_cdf(q) for q in m])
+    osr = sorted_values[i - 1]
+    slope, intercept = np.polyfit(osm, osr, 1)
+    return osm, osr, slope, intercept
+
+
+def anderson_pvalue(a2, n):
+    """P-valor aproximado de A² (parámetros estimados), D'Agostino & Stephens (1986); 0 desde AD_P_ZERO."""
+    a = np.asarray(a2, dtype=float) * (1 + 0.75 / n + 2.25 / n ** 2)
+    with np.errstate(over="ignore"):
+        p = np.where(a >= AD_P_ZERO, 0.0,
+            np.where(a >= 0.6, np.exp(1.2937 - 5.709 * a + 0.0186 * a ** 2),
+            np.where(a >= 0.34, np.exp(0.9177 - 4.279 * a - 1.38 * a ** 2),
+            np.where(a >= 0.2, 1 - np.exp(-8.318 + 42.796 * a - 59.938 * a ** 2),
+                     1 - np.exp(-13.436 + 101.14 * a - 223.73 * a ** 2)))))
+    return np.clip(p, 0.0, 1.0)
+
+
+def _anderson_block(S):
+    """A² de cada fila de S (bloque, n), filas ya ordenadas."""
+    from scipy.special import log_ndtr
+
+    n = S.shape[1]
+    z = S - S.mean(axis=1, keepdims=True)
+    z /= S.std(axis=1, ddof=1, keepdims=True)
+    w = (2 * np.arange(1, n + 1) - 1.0) / n
+    lower = log_ndtr(z)
+    upper = log_ndtr(np.negative(z, out=z), out=z)  # log(1 − Φ(z)), reutiliza z
+    lower += upper[:, ::-1]
+    return -n - lower @ w
+
+
+def _stratified_sample(sorted_values, k, rng):
+    """Una observación al azar de cada uno de `k` tramos consecutivos del orden (sigue ordenada)."""
+    n = len(sorted_values)
+    idx = np.floor((np.arange(k) + rng.random(k)) * n / k).astype(int)
+    return sorted_values[np.minimum(idx, n - 1)]
+
+
+def _empty():
+    return {"n": 0, "shapiro_p": np.nan, "shapiro_n": 0, "anderson_stat": np.nan, "anderson_p": np.nan,
+            "anderson_critical": None, "anderson_significance": None,
+            "dagostino_stat": np.nan, "dagostino_p": np.nan}
+
+
+def normality_table(df, cols, tests=True, qq_points=QQ_POINTS, seed=12345, max_bytes=DEFAULT_MAX_BYTES):
+    """{columna: resultados} con pruebas (si `tests`) y pares QQ (si `qq_points`).
+
+    Claves: n, shapiro_p, shapiro_n (observaciones usadas; < n si se submuestreó),
+    anderson_stat, anderson_p, anderson_critical, anderson_significance,
+    dagostino_stat, dagostino_p y qq (ver qq_pairs, o None).
+    """
+    cols = list(cols)
+    data = sorted_columns(df, cols)
+    out = {}
+    for col in cols:
+        res = _empty()
+        res["n"] = len(data[col])
+        if qq_points:
+            res["qq"] = qq_pairs(data[col], qq_points)
+        out[col] = res
+    if not tests:
+        return out
+
+    from scipy import stats
+
+    rng = np.random.default_rng(seed)
+    # columnas con el mismo n se prueban juntas, por bloques de filas acotados en memoria
+    by_n = {}
+    for col in cols:
+        if len(data[col]) >= MIN_N:
+            by_n.setdefault(len(data[col]), []).append(col)
+    for n, group in by_n.items():
+        rows = max(1, int(max_bytes // (n * 8 * 4)))
+        critical = np.round(AD_CRITICAL / (1.0 + 0.75 / n + 2.25 / n ** 2), 3)
+        for start in range(0, len(group), rows):
+            block = group[start:start + rows]
+            S = data[block[0]][None] if len(block) == 1 else np.stack([data[c] for c in block])
+            a2 = _anderson_block(S)
+            ad_p = anderson_pvalue(a2, n)
+            if n >= MIN_N_DAGOSTINO:
+                k2, k2_p = stats.normaltest(S, axis=1)
+            else:
+                k2 = k2_p = np.full(len(block), np.nan)
+            for j, col in enumerate(block):
+                sample = S[j] if n <= SHAPIRO_MAX else _stratified_sample(S[j], SHAPIRO_MAX, rng)
+                out[col].update({"shapiro_p": stats.shapiro(sample).pvalue, "shapiro_n": len(sample),
+                                 "anderson_stat": a2[j], "anderson_p": ad_p[j],
+                                 "anderson_critical": critical, "anderson_significance": AD_SIGNIFICANCE,
+                                 "dagostino_stat": k2[j], "dagostino_p": k2_p[j]})
+    return out
@@ -0,0 +1,117 @@
+# permutation.py — P-valores por permutación (Monte Carlo) para Mann–Whitney y Kruskal–Wallis
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Los datos se rankean una sola vez. Permutar las etiquetas de grupo equivale a
+# repartir los rangos al azar en bloques del tamaño de cada grupo: con claves
+# aleatorias y np.argpartition (sin ordenar del todo) cada fila de una matriz
+# (lote, N) es una permutación, y las sumas de rangos por grupo salen con
+# np.add.reduceat (los lotes se parten para no superar DEFAULT_MAX_BYTES).
+# Tras cada ronda se calcula un intervalo Clopper–Pearson del p-valor y se
+# detiene en cuanto la decisión frente a `alpha` queda fijada.
+#
+# El costo crece con N × permutaciones; por encima de PERMUTATION_MAX_N
+# observaciones la aproximación asintótica ya es precisa y analysis.py la usa
+# en lugar de permutar.
+
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+DEFAULT_N_PERM = 10_000
+DEFAULT_BATCH = 1000
+STOP_CONFIDENCE = 0.999
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+PERMUTATION_MAX_N = 5000
+
+
+def _groups_to_arrays(groups):
+    groups = [np.asarray(g, dtype=float) for g in groups]
+    # un grupo vacío no aporta rangos y rompería np.add.reduceat
+    groups = [g for g in (g[~np.isnan(g)] for g in groups) if len(g)]
+    sizes = np.array([len(g) for g in groups])
+    return np.concatenate(groups), sizes
+
+
+def _statistic(rank_sums, sizes, n_total, kind):
+    """Estadístico por fila a partir de las sumas de rangos (lote, k)."""
+    if kind == "mw":
+        n1, n2 = sizes[0], sizes[1]
+        u1 = rank_sums[:, 0] - n1 * (n1 + 1) / 2
+        return np.abs(u1 - n1 * n2 / 2)
+    # H sin corrección por empates: la corrección es constante bajo permutación
+    return 12.0 / (n_total * (n_total + 1)) * (rank_sums ** 2 / sizes).sum(axis=1) - 3 * (n_total + 1)
+
+
+def _batch_exceed(ranks, sizes, starts, observed, kind, b, seed, max_bytes=DEFAULT_MAX_BYTES):
+    """Cuántas de `b` permutaciones dan un estadístico ≥ al observado."""
+    rng = np.random.default_rng(seed)
+    n = len(ranks)
+    # por elemento: clave aleatoria (8 B) + índice de argpartition (8 B) + rango permutado (8 B)
+    rows = max(1, int(max_bytes // (n * 24)))
+    # tolerancia relativa para que empates numéricos con el observado cuenten
+    threshold = observed - 1e-9 * max(1.0, abs(observed))
+    exceed = 0
+    for start in range(0, b, rows):
+        m = min(rows, b - start)
+        idx = np.argpartition(rng.random((m, n)), starts[1:], axis=1)
+        sums = np.add.reduceat(ranks[idx], starts, axis=1)
+        exceed += int(np.count_nonzero(_statistic(sums, sizes, n, kind) >= threshold))
+    return exceed
+
+
+def _clopper_pearson(k, n, conf=STOP_CONFIDENCE):
+    from scipy import stats
+    a = (1 - conf) / 2
+    lo = stats.beta.ppf(a, k, n - k + 1) if k > 0 else 0.0
+    hi = stats.beta.ppf(1 - a, k + 1, n - k) if k < n else 1.0
+    return lo, hi
+
+
+def permutation_test(groups, kind="kw", n_perm=DEFAULT_N_PERM, batch=DEFAULT_BATCH, alpha=0.05,
+                     early_stop=True, seed=12345, workers=1):
+    """P-valor por permutación de las etiquetas de grupo.
+
+    groups: lista de arrays (uno por grupo; los NaN y los grupos vacíos se
+    descartan). kind: "mw" (dos grupos, bilateral) o "kw" (k grupos). Con
+    workers > 1 cada ronda reparte un lote por proceso.
+    Devuelve dict con p, n_perm usadas, intervalo del p-valor y si paró antes.
+    """
+    values, sizes = _groups_to_arrays(groups)
+    if kind == "mw" and len(sizes) != 2:
+        raise ValueError("Mann–Whitney requiere exactamente dos grupos no vacíos")
+    if len(sizes) < 2:
+        raise ValueError("Se requieren al menos dos grupos no vacíos")
+    from scipy import stats
+    ranks = stats.rankdata(values)
+    starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+    observed = _statistic(np.add.reduceat(ranks, starts)[None, :], sizes, len(ranks), kind)[0]
+
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_perm // batch))
+    exceed = done = 0
+    stopped = False
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        i = 0
+        while i < len(seeds):
+            round_seeds = seeds[i:i + max(1, workers)]
+            sizes_b = [min(batch, n_perm - (i + j) * batch) for j in range(len(round_seeds))]
+            args = [(ranks, sizes, starts, observed, kind, b, s) for b, s in zip(sizes_b, round_seeds)]
+            if pool is None:
+                counts = [_batch_exceed(*a) for a in args]
+            else:
+                counts = list(pool.map(_batch_exceed, *zip(*args)))
+            exceed += sum(counts)
+            done += sum(sizes_b)
+            i += len(round_seeds)
+            if early_stop and i < len(seeds):
+                lo, hi = _clopper_pearson(exceed, done)
+                if hi < alpha or lo > alpha:
+                    stopped = True
+                    break
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    lo, hi = _clopper_pearson(exceed, done)
+    return {"statistic": observed, "p": (exceed + 1) / (done + 1), "n_perm": done,
+            "p_ci": (lo, hi), "stopped_early": stopped}
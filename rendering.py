@@ -0,0 +1,255 @@
+# rendering.py — Gráficos plotly con modo "N grande" (agregación en servidor + WebGL)
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Hasta LARGE_N_THRESHOLD filas se usan las mismas figuras plotly.express de
+# siempre (todos los puntos viajan al navegador). Por encima, los histogramas,
+# densidades y estadísticos de caja se calculan aquí con numpy, las nubes de
+# puntos se submuestrean de forma estratificada y se dibujan con WebGL, y las
+# líneas de tendencia se ajustan sobre datos agrupados en bins. Los grupos por
+# nivel pueden venir ya resueltos (`partition`, {nivel: posiciones} del índice
+# de filtros) para no volver a agrupar el DataFrame.
+#
+# El QQ-plot también es plotly (sin matplotlib) y dibuja los pares cuantil
+# teórico / valor ordenado de normality.py: todos hasta LARGE_N_THRESHOLD,
+# submuestreados por encima.
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+LARGE_N_THRESHOLD = 5000
+MAX_POINTS = 5000
+MIN_POINTS_PER_GROUP = 50
+TREND_BINS = 100
+KDE_GRID = 256
+
+COLORS = px.colors.qualitative.Plotly
+
+
+def is_large(df):
+    return len(df) > LARGE_N_THRESHOLD
+
+
+def payload_kb(fig):
+    """Tamaño aproximado (KB) del JSON que se envía al navegador."""
+    return len(fig.to_json()) / 1024
+
+
+# -------------------- Agregados en servidor --------------------
+def box_stats(values):
+    """Cuartiles y bigotes (1.5·IQR) como los calcula plotly, para go.Box precalculado."""
+    v = np.asarray(values, dtype=float)
+    v = v[~np.isnan(v)]
+    q1, med, q3 = np.percentile(v, [25, 50, 75])
+    iqr = q3 - q1
+    lower = v[v >= q1 - 1.5 * iqr].min()
+    upper = v[v <= q3 + 1.5 * iqr].max()
+    return {"q1": q1, "median": med, "q3": q3, "lowerfence": lower, "upperfence": upper,
+            "mean": v.mean(), "n": len(v)}
+
+
+def binned_kde(values, grid_size=KDE_GRID):
+    """Densidad por kernel gaussiano (ancho de Silverman) sobre un histograma fino: O(n)."""
+    v = np.asarray(values, dtype=float)
+    v = v[~np.isnan(v)]
+    lo, hi = v.min(), v.max()
+    if hi == lo:
+        return np.array([lo]), np.array([1.0])
+    counts, edges = np.histogram(v, bins=grid_size, range=(lo, hi))
+    centers = (edges[:-1] + edges[1:]) / 2
+    iqr = np.subtract(*np.percentile(v, [75, 25]))
+    spread = min(v.std(), iqr / 1.34) if iqr > 0 else v.std()
+    bw = 1.06 * spread * len(v) ** (-1 / 5)
+    sigma = max(bw / (edges[1] - edges[0]), 1e-6)
+    # más allá de grid_size bins el kernel no toca ningún punto de la grilla
+    half = min(int(4 * sigma) + 1, grid_size)
+    k = np.arange(-half, half + 1)
+    kernel = np.exp(-0.5 * (k / sigma) ** 2)
+    dens = np.convolve(counts, kernel)[half:half + grid_size]
+    return centers, dens / dens.max()
+
+
+def stratified_sample(df, by=None, max_points=MAX_POINTS, seed=0, partition=None):
+    """Submuestra proporcional por grupo, garantizando hasta MIN_POINTS_PER_GROUP filas por grupo."""
+    if len(df) <= max_points:
+        return df
+    rng = np.random.default_rng(seed)
+    frac = max_points / len(df)
+    if by is None or by not in df.columns:
+        keep = rng.random(len(df)) < frac
+    else:
+        sizes = _group_sizes(df, by, partition)
+        keep = rng.random(len(df)) < np.maximum(frac, np.minimum(1.0, MIN_POINTS_PER_GROUP / sizes))
+    return df[keep]
+
+
+def binned_trend(x, y, kind="ols", bins=TREND_BINS):
+    """Línea de tendencia ajustada sobre medias por bin de cuantiles de x."""
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    ok = ~(np.isnan(x) | np.isnan(y))
+    x, y = x[ok], y[ok]
+    if len(x) < 3:
+        return None, None
+    edges = np.unique(np.quantile(x, np.linspace(0, 1, bins + 1)))
+    if len(edges) < 3:
+        return None, None
+    b = np.clip(np.searchsorted(edges, x, side="right") - 1, 0, len(edges) - 2)
+    cnt = np.bincount(b, minlength=len(edges) - 1)
+    nz = cnt > 0
+    mx = np.bincount(b, weights=x, minlength=len(cnt))[nz] / cnt[nz]
+    my = np.bincount(b, weights=y, minlength=len(cnt))[nz] / cnt[nz]
+    if kind == "lowess":
+        from statsmodels.nonparametric.smoothers_lowess import lowess
+        fit = lowess(my, mx, frac=2 / 3)
+        return fit[:, 0], fit[:, 1]
+    slope, intercept = np.polyfit(mx, my, 1, w=np.sqrt(cnt[nz]))
+    xs = np.array([x.min(), x.max()])
+    return xs, intercept + slope * xs
+
+
+def _group_sizes(df, by, partition=None):
+    """Tamaño del grupo de cada fila (NaN sin grupo), como groupby(...).transform("size")."""
+    if partition is None:
+        return df.groupby(by, observed=True)[by].transform("size").to_numpy()
+    sizes = np.full(len(df), np.nan)
+    for pos in partition.values():
+        sizes[pos] = len(pos)
+    return sizes
+
+
+def _groups(df, by, partition=None):
+    if by is None:
+        return [(None, df)]
+    if partition is not None:
+        return [(level, df.iloc[pos]) for level, pos in partition.items()]
+    return [(level, g) for level, g in df.groupby(by, observed=True)]
+
+
+# -------------------- Figuras --------------------
+def histogram_figure(df, col, nbins=30, binned=None):
+    """`binned` = (conteos, bordes, stats de caja) ya agregados (p. ej. por streaming.py)."""
+    title = f"Histograma y boxplot — {col}"
+    if not is_large(df):
+        return px.histogram(df, x=col, nbins=nbins, marginal="box", title=title)
+    if binned is None:
+        v = df[col].dropna().to_numpy(dtype=float)
+        binned = (*np.histogram(v, bins=nbins), box_stats(v)) if len(v) else (None, None, None)
+    counts, edges, bs = binned
+    fig = make_subplots(rows=2, cols=1, shared_xaxes=True, row_heights=[0.2, 0.8], vertical_spacing=0.02)
+    if bs is not None:
+        fig.add_trace(go.Box(q1=[bs["q1"]], median=[bs["median"]], q3=[bs["q3"]],
+                             lowerfence=[bs["lowerfence"]], upperfence=[bs["upperfence"]],
+                             y=[col], orientation="h", marker_color=COLORS[0], showlegend=False), row=1, col=1)
+        fig.add_trace(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                             marker_color=COLORS[0], showlegend=False), row=2, col=1)
+    fig.update_yaxes(showticklabels=False, row=1, col=1)
+    fig.update_layout(title=title, bargap=0)
+    fig.update_xaxes(title_text=col, row=2, col=1)
+    fig.update_yaxes(title_text="count", row=2, col=1)
+    return fig
+
+
+def violin_figure(df, x, y, title, partition=None):
+    if not is_large(df):
+        return px.violin(df, x=x, y=y, box=True, points="all", title=title)
+    fig = go.Figure()
+    ticks = []
+    for i, (level, g) in enumerate(_groups(df, x, partition)):
+        v = g[y].dropna().to_numpy(dtype=float)
+        if len(v) == 0:
+            continue
+        ticks.append((i, level))
+        grid, dens = binned_kde(v)
+        half = 0.4 * dens
+        color = COLORS[i % len(COLORS)]
+        fig.add_trace(go.Scatter(x=np.concatenate([i - half, (i + half)[::-1]]),
+                                 y=np.concatenate([grid, grid[::-1]]),
+                                 fill="toself", mode="lines", line_color=color, name=str(level),
+                                 hoverinfo="skip", showlegend=False))
+        bs = box_stats(v)
+        fig.add_trace(go.Box(x=[i], q1=[bs["q1"]], median=[bs["median"]], q3=[bs["q3"]],
+                             lowerfence=[bs["lowerfence"]], upperfence=[bs["upperfence"]],
+                             width=0.1, marker_color=color, showlegend=False))
+    fig.update_layout(title=title, xaxis=dict(tickvals=[t[0] for t in ticks], ticktext=[str(t[1]) for t in ticks], title=x),
+                      yaxis_title=y)
+    return fig
+
+
+def box_figure(df, x, y, title, color=None, partition=None):
+    if not is_large(df):
+        return px.box(df, x=x, y=y, points="all", color=color, title=title)
+    fig = go.Figure()
+    groups = [(level, g[y].dropna().to_numpy(dtype=float)) for level, g in _groups(df, x, partition)]
+    # submuestra estratificada de los puntos, como stratified_sample, nivel por nivel
+    rng = np.random.default_rng(0)
+    frac = MAX_POINTS / max(1, sum(len(v) for _, v in groups))
+    for i, (level, v) in enumerate(groups):
+        if len(v) == 0:
+            continue
+        c = COLORS[i % len(COLORS)]
+        bs = box_stats(v)
+        fig.add_trace(go.Box(x=[str(level)], q1=[bs["q1"]], median=[bs["median"]], q3=[bs["q3"]],
+                             lowerfence=[bs["lowerfence"]], upperfence=[bs["upperfence"]],
+                             mean=[bs["mean"]], name=str(level), marker_color=c))
+        pts = v[rng.random(len(v)) < max(frac, min(1.0, MIN_POINTS_PER_GROUP / len(v)))]
+        fig.add_trace(go.Scattergl(x=np.full(len(pts), str(level)), y=pts, mode="markers",
+                                   marker=dict(color=c, size=3, opacity=0.4),
+                                   showlegend=False, hoverinfo="y"))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y, xaxis_type="category")
+    return fig
+
+
+def scatter_figure(df, x, y, color=None, size=None, trendline=None, hover_data=None, title=None,
+                   partition=None):
+    if not is_large(df):
+        return px.scatter(df, x=x, y=y, color=color, size=size, trendline=trendline,
+                          hover_data=hover_data, title=title)
+    sample = stratified_sample(df, by=color, partition=partition)
+    groups = _groups(df, color, partition)
+    # un mismo color por nivel para los puntos (submuestra) y su línea de tendencia
+    palette = {level: COLORS[i % len(COLORS)] for i, (level, _) in enumerate(groups)} if color else {}
+    fig = px.scatter(sample, x=x, y=y, color=color, size=size, hover_data=hover_data,
+                     title=title, render_mode="webgl", opacity=0.5,
+                     color_discrete_map=palette or None,
+                     category_orders={color: list(palette)} if color else None)
+    if trendline:
+        for level, g in groups:
+            xs, ys = binned_trend(g[x], g[y], kind=trendline)
+            if xs is None:
+                continue
+            fig.add_trace(go.Scatter(x=xs, y=ys, mode="lines", showlegend=False,
+                                     line_color=palette[level] if color else "#0F4C81",
+                                     name=f"{trendline} {level}" if color else trendline))
+    return fig
+
+
+def qq_figure(col, pts):
+    """`pts` = (cuantiles teóricos, valores ordenados, pendiente, intercepto) de normality.qq_pairs, o None."""
+    title = f"QQ-plot — {col}"
+    fig = go.Figure()
+    if pts is None:
+        fig.add_annotation(text="Insuficientes datos para QQ-plot", showarrow=False, x=0.5, y=0.5,
+                           xref="paper", yref="paper", font_size=14)
+        fig.update_layout(title=title, xaxis_visible=False, yaxis_visible=False)
+        return fig
+    osm, osr, slope, intercept = pts
+    fig.add_trace(go.Scatter(x=osm, y=osr, mode="markers", marker=dict(color=COLORS[0], size=5),
+                             name="Valores ordenados", showlegend=False))
+    xs = np.array([osm[0], osm[-1]])
+    fig.add_trace(go.Scatter(x=xs, y=intercept + slope * xs, mode="lines", line_color="#d62728",
+                             name="Recta de referencia", showlegend=False))
+    fig.update_layout(title=title, xaxis_title="Cuantiles teóricos", yaxis_title="Valores ordenados")
+    return fig
+
+
+def density_contour_figure(df, x, y, bins=80):
+    if not is_large(df):
+        return px.density_contour(df, x=x, y=y)
+    tmp = df[[x, y]].dropna()
+    H, xe, ye = np.histogram2d(tmp[x].to_numpy(dtype=float), tmp[y].to_numpy(dtype=float), bins=bins)
+    fig = go.Figure(go.Contour(z=H.T, x=(xe[:-1] + xe[1:]) / 2, y=(ye[:-1] + ye[1:]) / 2,
+                               contours_coloring="lines", showscale=False))
+    fig.update_layout(xaxis_title=x, yaxis_title=y)
+    return fig
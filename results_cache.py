@@ -0,0 +1,57 @@
+# results_cache.py — Caché LRU acotada de resultados de pruebas estadísticas
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# La clave combina la versión del dataset, la selección de filtros de la barra
+# lateral y el nombre + parámetros de la prueba, de modo que cada prueba se
+# calcula una sola vez por estado de filtros y volver a un filtro previo es
+# inmediato. Los valores se comparten entre sesiones: tratarlos como inmutables.
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAXSIZE = 256
+
+
+def filter_key(dataset_version, sexo_sel, estrato_sel, nomob_sel):
+    """Clave normalizada (independiente del orden de selección) de un estado de filtros."""
+    return (dataset_version, tuple(sorted(sexo_sel)), tuple(sorted(estrato_sel)), tuple(sorted(nomob_sel)))
+
+
+class ResultsCache:
+    def __init__(self, maxsize=DEFAULT_MAXSIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._data
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_compute(self, key, compute):
+        """Devuelve el valor de `key`; si no existe lo calcula con `compute()` y lo guarda."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
@@ -0,0 +1,248 @@
+# streaming.py — Ingesta por bloques y descriptivas incrementales en una pasada
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# El archivo se lee por bloques (CSV con chunksize, Excel con openpyxl en modo
+# sólo lectura) y cada bloque actualiza acumuladores combinables por grupo:
+# conteo, media y varianza (Welford/Chan), mínimo/máximo y un sketch de
+# cuantiles tipo KLL para mediana y cuartiles. Como los acumuladores se pueden
+# combinar, la tabla descriptiva de cualquier selección de filtros se obtiene
+# uniendo las celdas (Sexo × Estrato × Nomofobia?) seleccionadas.
+#
+# stream_descriptives recorre el archivo fuente sin tener nunca el dataset
+# completo en memoria (motor / CLI sobre archivos grandes). Si el DataFrame ya
+# está cargado (el dashboard, sobre el sidecar Arrow), frame_descriptives
+# construye los mismos acumuladores desde él, sin volver a parsear la fuente.
+
+import math
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from data_loader import clean_dataframe
+
+DEFAULT_CHUNKSIZE = 50_000
+DEFAULT_K = 2048
+
+
+def iter_chunks(path, chunksize=DEFAULT_CHUNKSIZE):
+    """Bloques limpios (clean_dataframe) del archivo fuente, de a `chunksize` filas."""
+    path = Path(path)
+    if path.suffix.lower() == ".csv":
+        for chunk in pd.read_csv(path, chunksize=chunksize):
+            yield clean_dataframe(chunk)
+        return
+
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.active.iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows, [])]
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= chunksize:
+                yield clean_dataframe(pd.DataFrame(batch, columns=header))
+                batch = []
+        if batch:
+            yield clean_dataframe(pd.DataFrame(batch, columns=header))
+    finally:
+        wb.close()
+
+
+class Moments:
+    """Conteo, media y M2 (suma de cuadrados centrada), combinables (Chan et al.)."""
+
+    def __init__(self):
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+
+    def update(self, values):
+        v = np.asarray(values, dtype=float)
+        v = v[~np.isnan(v)]
+        if len(v):
+            other = Moments()
+            other.n = len(v)
+            other.mean = v.mean()
+            other.m2 = ((v - other.mean) ** 2).sum()
+            self.merge(other)
+
+    def merge(self, other):
+        if other.n == 0:
+            return self
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        self.mean += delta * other.n / n
+        self.m2 += other.m2 + delta ** 2 * self.n * other.n / n
+        self.n = n
+        return self
+
+    @property
+    def std(self):
+        return math.sqrt(self.m2 / (self.n - 1)) if self.n > 1 else np.nan
+
+
+class QuantileSketch:
+    """Sketch de cuantiles tipo KLL: niveles de buffers; al llenarse uno, se ordena y
+    se promueve la mitad de los elementos (alternos) al nivel siguiente con peso doble.
+
+    Mientras no haya compactaciones guarda todos los valores y los cuantiles son exactos.
+    """
+
+    def __init__(self, k=DEFAULT_K, seed=0):
+        self.k = k
+        self.levels = [np.empty(0)]
+        self.n = 0
+        self.min = np.inf
+        self.max = -np.inf
+        self._rng = np.random.default_rng(seed)
+
+    @property
+    def exact(self):
+        return len(self.levels) == 1
+
+    def update(self, values):
+        v = np.asarray(values, dtype=float)
+        v = v[~np.isnan(v)]
+        if len(v) == 0:
+            return
+        self.n += len(v)
+        self.min = min(self.min, v.min())
+        self.max = max(self.max, v.max())
+        self.levels[0] = np.concatenate([self.levels[0], v])
+        self._compress()
+
+    def merge(self, other):
+        for h, buf in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], buf])
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self._compress()
+        return self
+
+    def _compress(self):
+        h = 0
+        while h < len(self.levels):
+            buf = self.levels[h]
+            if len(buf) > self.k:
+                buf = np.sort(buf)
+                stay = buf[-1:] if len(buf) % 2 else buf[:0]
+                pairs = buf[:len(buf) - len(stay)]
+                promoted = pairs[self._rng.integers(2)::2]
+                self.levels[h] = stay
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    def _weighted(self):
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(b), 2.0 ** h) for h, b in enumerate(self.levels)])
+        order = np.argsort(items, kind="stable")
+        return items[order], weights[order]
+
+    def quantiles(self, qs):
+        qs = np.asarray(qs, dtype=float)
+        if self.n == 0:
+            return np.full(qs.shape, np.nan)
+        if self.exact:
+            return np.percentile(self.levels[0], 100 * qs)
+        items, w = self._weighted()
+        cum = np.cumsum(w) - w / 2
+        out = np.interp(qs * self.n, cum, items)
+        out = np.where(qs <= 0, self.min, np.where(qs >= 1, self.max, out))
+        return out
+
+    def histogram(self, bins=30):
+        if self.n == 0:
+            return np.zeros(bins), np.linspace(0, 1, bins + 1)
+        items, w = self._weighted()
+        hi = self.max if self.max > self.min else self.min + 1
+        return np.histogram(items, bins=bins, range=(self.min, hi), weights=w)
+
+
+class GroupedDescriptives:
+    """Acumuladores (Moments + QuantileSketch) por celda de `by` y por columna."""
+
+    def __init__(self, columns, by=None, k=DEFAULT_K):
+        self.columns = list(columns)
+        self.by = list(by or [])
+        self.k = k
+        self.cells = {}
+
+    def _cell(self, key):
+        cell = self.cells.get(key)
+        if cell is None:
+            cell = {col: (Moments(), QuantileSketch(self.k)) for col in self.columns}
+            self.cells[key] = cell
+        return cell
+
+    def update(self, chunk):
+        cols = [c for c in self.columns if c in chunk.columns]
+        by = [b for b in self.by if b in chunk.columns]
+        groups = chunk.groupby(by, sort=False, dropna=False, observed=True) if by else [((), chunk)]
+        for key, g in groups:
+            key = key if isinstance(key, tuple) else (key,)
+            cell = self._cell(key)
+            for col in cols:
+                values = g[col].to_numpy(dtype=float)
+                cell[col][0].update(values)
+                cell[col][1].update(values)
+        return self
+
+    def merged(self, selection=None):
+        """{columna: (Moments, QuantileSketch)} de las celdas que cumplen {columna_by: niveles}."""
+        selection = selection or {}
+        allowed = [set(selection[b]) if b in selection else None for b in self.by]
+        out = {col: (Moments(), QuantileSketch(self.k)) for col in self.columns}
+        for key, cell in self.cells.items():
+            if any(a is not None and level not in a for a, level in zip(allowed, key)):
+                continue
+            for col in self.columns:
+                out[col][0].merge(cell[col][0])
+                out[col][1].merge(cell[col][1])
+        return out
+
+    def table(self, selection=None, columns=None):
+        """Tabla con las mismas columnas que DataFrame.describe().T (50% -> mediana)."""
+        merged = self.merged(selection)
+        rows = {}
+        for col in columns or self.columns:
+            m, sk = merged[col]
+            q1, med, q3 = sk.quantiles([0.25, 0.5, 0.75])
+            rows[col] = {"count": float(m.n), "mean": m.mean if m.n else np.nan, "std": m.std,
+                         "min": sk.min if m.n else np.nan, "25%": q1, "mediana": med, "75%": q3,
+                         "max": sk.max if m.n else np.nan}
+        return pd.DataFrame.from_dict(rows, orient="index")
+
+    def histogram(self, col, selection=None, bins=30):
+        """(conteos, bordes, stats de caja) de `col` para la selección, aproximados por el sketch."""
+        m, sk = self.merged(selection)[col]
+        counts, edges = sk.histogram(bins)
+        if sk.n == 0:
+            return counts, edges, None
+        q1, med, q3 = sk.quantiles([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        box = {"q1": q1, "median": med, "q3": q3, "lowerfence": max(sk.min, q1 - 1.5 * iqr),
+               "upperfence": min(sk.max, q3 + 1.5 * iqr), "mean": m.mean, "n": m.n}
+        return counts, edges, box
+
+
+def stream_descriptives(path, columns, by=None, chunksize=DEFAULT_CHUNKSIZE, k=DEFAULT_K):
+    """Recorre el archivo una vez y devuelve los acumuladores por grupo."""
+    acc = GroupedDescriptives(columns, by=by, k=k)
+    for chunk in iter_chunks(path, chunksize=chunksize):
+        acc.update(chunk)
+    return acc
+
+
+def frame_descriptives(df, columns, by=None, chunksize=DEFAULT_CHUNKSIZE, k=DEFAULT_K):
+    """Los mismos acumuladores a partir de un DataFrame ya limpio, por bloques de filas."""
+    acc = GroupedDescriptives(columns, by=by, k=k)
+    for start in range(0, len(df), chunksize):
+        acc.update(df.iloc[start:start + chunksize])
+    return acc
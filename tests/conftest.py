@@ -0,0 +1,18 @@
+# tests/conftest.py — Configuración común de pytest
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+#
+# Los módulos del dashboard viven en la raíz del repositorio (sin paquete):
+# se agrega al path para poder ejecutar `pytest` desde cualquier directorio.
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(2025)
@@ -0,0 +1,138 @@
+# tests/test_bootstrap.py — Bootstrap vectorizado de Spearman contra scipy.stats.spearmanr
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import bootstrap
+from bootstrap import bootstrap_spearman, jackknife_spearman, spearman_ci, spearman_ci_by_column
+
+BY_ROWS, BY_PAIRS = 0.0, 1.0
+
+
+def _data(rng, n=60):
+    # valores redondeados: muchos empates, como las escalas Likert de la encuesta
+    x = np.round(rng.normal(5, 2, n), 1)
+    Y = np.column_stack([np.round(x + rng.normal(0, 2, n)), rng.integers(1, 6, n)]).astype(float)
+    return x, Y
+
+
+@pytest.fixture(params=[BY_ROWS, BY_PAIRS], ids=["filas", "pares"])
+def path(request, monkeypatch):
+    # fuerza el remuestreo por índices de fila o por pares distintos con pesos
+    monkeypatch.setattr(bootstrap, "MAX_UNIQUE_FRACTION", request.param)
+    return request.param
+
+
+def test_bootstrap_matches_spearmanr_per_resample(rng, monkeypatch):
+    monkeypatch.setattr(bootstrap, "MAX_UNIQUE_FRACTION", BY_ROWS)
+    x, Y = _data(rng)
+    boots = bootstrap_spearman(x, Y, n_boot=50, seed=7)
+    idx = np.random.default_rng(7).integers(0, len(x), (50, len(x)))
+    for b, rows in enumerate(idx):
+        for j in range(Y.shape[1]):
+            expected = stats.spearmanr(x[rows], Y[rows, j]).correlation
+            np.testing.assert_allclose(boots[b, j], expected, rtol=1e-12, atol=1e-12)
+
+
+def test_weighted_pairs_match_expanded_rows(rng):
+    x, Y = _data(rng)
+    x_codes, ux = bootstrap._dense_codes(x)
+    y_codes, uy = bootstrap._dense_codes(Y[:, 1])
+    xc, yc, freq, inverse = bootstrap._unique_pairs(x_codes, ux, y_codes, uy, return_inverse=True)
+    np.testing.assert_array_equal(np.bincount(inverse), freq)
+    W = rng.multinomial(len(x), freq / freq.sum(), size=30)
+    W[0] = freq
+    rho = bootstrap._weighted_corr(xc, ux, yc, uy, W.astype(float))
+    # cada par representa a sus filas; basta una fila original por par
+    first = np.zeros(len(freq), dtype=int)
+    first[inverse[::-1]] = np.arange(len(x))[::-1]
+    for b, w in enumerate(W):
+        rows = np.repeat(first, w)
+        expected = stats.spearmanr(x[rows], Y[rows, 1]).correlation
+        np.testing.assert_allclose(rho[b], expected, rtol=1e-12, atol=1e-12)
+
+
+def test_bootstrap_by_pairs_is_used_for_discrete_columns(rng):
+    x = rng.integers(1, 6, 2000).astype(float)
+    Y = np.column_stack([x + rng.integers(0, 3, 2000), rng.normal(size=2000)])
+    boots = bootstrap_spearman(x, Y, n_boot=20, seed=1)
+    # la columna continua sigue por índices de fila, con los mismos índices que antes
+    idx = np.random.default_rng(1).integers(0, len(x), (20, len(x)))
+    for b, rows in enumerate(idx[:3]):
+        expected = stats.spearmanr(x[rows], Y[rows, 1]).correlation
+        np.testing.assert_allclose(boots[b, 1], expected, rtol=1e-12, atol=1e-12)
+    assert np.all(np.abs(boots[:, 0] - stats.spearmanr(x, Y[:, 0]).correlation) < 0.1)
+
+
+def test_paths_agree_up_to_monte_carlo(rng, monkeypatch):
+    x = rng.integers(1, 8, 3000).astype(float)
+    Y = (x + rng.integers(-3, 4, 3000))[:, None]
+    monkeypatch.setattr(bootstrap, "MAX_UNIQUE_FRACTION", BY_ROWS)
+    rows = spearman_ci(x, Y, n_boot=2000, method="bca", seed=4)
+    monkeypatch.setattr(bootstrap, "MAX_UNIQUE_FRACTION", BY_PAIRS)
+    pairs = spearman_ci(x, Y, n_boot=2000, method="bca", seed=4)
+    np.testing.assert_allclose(rows, pairs, atol=0.01)
+
+
+def test_bootstrap_chunking_does_not_change_result(rng, path):
+    x, Y = _data(rng)
+    whole = bootstrap_spearman(x, Y, n_boot=40, seed=3)
+    chunked = bootstrap_spearman(x, Y, n_boot=40, seed=3, max_bytes=1)
+    np.testing.assert_array_equal(whole, chunked)
+
+
+def test_jackknife_is_leave_one_out_below_max_groups(rng, path):
+    x, Y = _data(rng, n=30)
+    jack = jackknife_spearman(x, Y)
+    for i in range(len(x)):
+        keep = np.arange(len(x)) != i
+        for j in range(Y.shape[1]):
+            expected = stats.spearmanr(x[keep], Y[keep, j]).correlation
+            np.testing.assert_allclose(jack[i, j], expected, rtol=1e-12, atol=1e-12)
+
+
+def test_grouped_jackknife_same_on_both_paths(rng, monkeypatch):
+    x, Y = _data(rng, n=1200)
+    monkeypatch.setattr(bootstrap, "MAX_UNIQUE_FRACTION", BY_ROWS)
+    rows = jackknife_spearman(x, Y, max_groups=70, max_bytes=1)
+    monkeypatch.setattr(bootstrap, "MAX_UNIQUE_FRACTION", BY_PAIRS)
+    pairs = jackknife_spearman(x, Y, max_groups=70, max_bytes=1)
+    np.testing.assert_allclose(rows, pairs, rtol=1e-12, atol=1e-12)
+
+
+def test_percentile_interval(rng):
+    x, Y = _data(rng)
+    lo, hi = spearman_ci(x, Y, n_boot=200, seed=11)
+    boots = bootstrap_spearman(x, Y, n_boot=200, seed=11)
+    np.testing.assert_allclose(lo, np.percentile(boots, 2.5, axis=0))
+    np.testing.assert_allclose(hi, np.percentile(boots, 97.5, axis=0))
+
+
+def test_bca_close_to_scipy_bootstrap(rng):
+    x, Y = _data(rng, n=150)
+    lo, hi = spearman_ci(x, Y[:, :1], n_boot=4000, method="bca", seed=5)
+    ref = stats.bootstrap((x, Y[:, 0]), lambda a, b: stats.spearmanr(a, b).correlation, paired=True,
+                          vectorized=False, n_resamples=4000, method="BCa", random_state=5).confidence_interval
+    # remuestreos distintos: sólo se exige el mismo intervalo salvo error Monte Carlo
+    assert lo[0] == pytest.approx(ref.low, abs=0.03)
+    assert hi[0] == pytest.approx(ref.high, abs=0.03)
+
+
+def test_by_column_uses_complete_pairs(rng):
+    x, Y = _data(rng)
+    df = pd.DataFrame({"t": x, "a": Y[:, 0], "b": Y[:, 1]})
+    df.loc[[1, 5, 9], "a"] = np.nan
+    res = spearman_ci_by_column(df, "t", ["a", "b"], n_boot=100, seed=2)
+    ok = df["a"].notna().to_numpy()
+    lo, hi = spearman_ci(x[ok], Y[ok, 0], n_boot=100, seed=2)
+    assert res["a"] == (lo[0], hi[0])
+    lo, hi = spearman_ci(x, Y[:, 1], n_boot=100, seed=2)
+    assert res["b"] == (lo[0], hi[0])
+
+
+def test_by_column_skips_small_samples():
+    df = pd.DataFrame({"t": np.arange(8.0), "a": np.arange(8.0)[::-1]})
+    assert spearman_ci_by_column(df, "t", ["a"], n_boot=10) == {}
@@ -0,0 +1,100 @@
+# tests/test_data_loader.py — Sidecar Arrow: ida y vuelta, invalidación y limpieza
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import data_loader
+from data_loader import SharedDataset, compact_dataframe, load_dataset, read_sidecar, sidecar_path, write_sidecar
+
+pytest.importorskip("pyarrow")
+
+
+def _survey(rng, n=200):
+    df = pd.DataFrame({
+        "Sexo": rng.choice(["Mujer", "Hombre"], n),
+        "Estrato": rng.choice(["1", "2", "3"], n),
+        "Edad": rng.integers(15, 60, n),
+        "Horas_Uso": rng.integers(0, 24, n) / 2,   # exacto en float32
+        "Nomofobia": rng.integers(1, 6, (n, 3)).mean(axis=1),  # promedios: no caben en float32
+    })
+    df.loc[[0, 5], "Horas_Uso"] = np.nan
+    df.loc[[3], "Nomofobia"] = np.nan
+    return df
+
+
+def test_compact_uses_float32_only_when_exact(rng):
+    df = compact_dataframe(_survey(rng))
+    assert df["Horas_Uso"].dtype == np.float32
+    assert df["Nomofobia"].dtype == np.float64
+    assert df["Edad"].dtype == np.int8
+    assert isinstance(df["Sexo"].dtype, pd.CategoricalDtype)
+
+
+def test_sidecar_round_trip(rng, tmp_path):
+    df = compact_dataframe(_survey(rng))
+    write_sidecar(df, tmp_path / "s.arrow")
+    back = read_sidecar(tmp_path / "s.arrow")
+    pd.testing.assert_frame_equal(back, df)
+    # NaN sigue siendo NaN (no nulo de Arrow) y las categóricas conservan sus niveles
+    assert back["Horas_Uso"].isna().sum() == 2
+    assert list(back["Estrato"].cat.categories) == ["1", "2", "3"]
+
+
+def test_load_dataset_invalidates_on_source_change(rng, tmp_path):
+    src, cache = tmp_path / "w1.csv", tmp_path / "cache"
+    _survey(rng).to_csv(src, index=False)
+    first = load_dataset(src, cache_dir=cache)
+    old = sidecar_path(src, data_loader.file_fingerprint(src)[2], cache)
+    assert old.exists()
+    pd.testing.assert_frame_equal(load_dataset(src, cache_dir=cache), first)
+
+    changed = _survey(np.random.default_rng(1))
+    changed.to_csv(src, index=False)
+    os.utime(src, ns=(1, 1))  # mtime distinto aunque el reloj no avance
+    fresh = load_dataset(src, cache_dir=cache)
+    pd.testing.assert_frame_equal(fresh, compact_dataframe(data_loader.clean_dataframe(changed)))
+    assert not old.exists() and len(list(cache.iterdir())) == 1
+
+
+def test_stale_cleanup_keeps_other_sources(rng, tmp_path):
+    cache = tmp_path / "cache"
+    cache.mkdir()
+    for name in ("w1.csv", "w1.xlsx.csv", "w10.csv"):
+        _survey(rng).to_csv(tmp_path / name, index=False)
+    legacy = [cache / "w1.0123456789abcdef.arrow", cache / "w1.0123456789abcdef.parquet"]
+    for p in legacy:
+        p.write_bytes(b"")
+    others = [cache / "w1.notadigest.arrow"]
+    others[0].write_bytes(b"")
+    load_dataset(tmp_path / "w10.csv", cache_dir=cache)
+    load_dataset(tmp_path / "w1.xlsx.csv", cache_dir=cache)
+    load_dataset(tmp_path / "w1.csv", cache_dir=cache)
+    assert not any(p.exists() for p in legacy)
+    assert all(p.exists() for p in others)
+    # cada fuente conserva su sidecar vigente
+    assert len(list(cache.glob("*.csv.*.arrow"))) == 3
+
+
+def test_stale_cleanup_runs_on_cache_hit(rng, tmp_path):
+    src, cache = tmp_path / "w1.csv", tmp_path / "cache"
+    _survey(rng).to_csv(src, index=False)
+    load_dataset(src, cache_dir=cache)
+    legacy = cache / "w1.0123456789abcdef.arrow"
+    legacy.write_bytes(b"")
+    load_dataset(src, cache_dir=cache)
+    assert not legacy.exists()
+
+
+def test_shared_dataset_select(rng):
+    data = SharedDataset(compact_dataframe(_survey(rng)))
+    assert data.select(np.arange(data.n_rows)) is data.frame
+    rows = np.flatnonzero(data.frame["Estrato"] != "2")
+    sub = data.select(rows)
+    assert list(sub["Estrato"].cat.categories) == ["1", "3"]
+    assert data.frame["Estrato"].cat.categories.tolist() == ["1", "2", "3"]
+    fp = data.footprint(sub, rows)
+    assert fp["session_mb"] > rows.nbytes / 1e6 and data.footprint(data.frame, rows)["session_mb"] == rows.nbytes / 1e6
@@ -0,0 +1,106 @@
+# tests/test_executor.py — Pool de secciones: tiempo límite, caché, deduplicación y modo serie
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import os
+import threading
+
+import pytest
+
+from executor import SectionExecutor, SectionTimeout
+from results_cache import ResultsCache
+
+KEY = ("filtros", "prueba", (), ())
+
+
+def _crash():
+    os._exit(1)
+
+
+@pytest.fixture
+def executor():
+    ex = SectionExecutor(ResultsCache(), mode="thread", max_workers=2)
+    yield ex
+    ex.shutdown()
+
+
+def _blocked(release, calls, value=42):
+    def fn():
+        calls.append(1)
+        release.wait(5)
+        return value
+    return fn
+
+
+def _unexpected():
+    raise AssertionError("no debía calcularse en serie")
+
+
+def test_timeout_raises_and_late_result_lands_in_cache(executor):
+    release, calls = threading.Event(), []
+    executor.submit(KEY, _blocked(release, calls), timeout=0.05)
+    with pytest.raises(SectionTimeout) as info:
+        executor.get(KEY, _unexpected)
+    assert info.value.key == KEY and info.value.timeout == 0.05
+    assert KEY not in executor.cache
+
+    # los callbacks corren en orden de registro: cuando éste corre, el del ejecutor ya guardó el resultado
+    finished = threading.Event()
+    executor._pending[KEY].add_done_callback(lambda f: finished.set())
+    release.set()
+    assert finished.wait(5)
+    assert KEY in executor.cache and KEY not in executor._pending
+    assert executor.get(KEY, _unexpected) == 42 and calls == [1]
+
+
+def test_submit_deduplicates_pending_and_cached_keys(executor):
+    release, calls = threading.Event(), []
+    fn = _blocked(release, calls)
+    executor.submit(KEY, fn)
+    executor.submit(KEY, fn)
+    release.set()
+    assert executor.get(KEY, _unexpected) == 42
+    executor.submit(KEY, fn)
+    assert calls == [1] and executor.cache.misses == 1
+
+
+def test_task_errors_propagate_and_are_not_cached(executor):
+    release = threading.Event()
+
+    def fail():
+        release.wait(5)
+        raise ValueError("datos inválidos")
+    executor.submit(KEY, fail)
+    threading.Timer(0.05, release.set).start()
+    with pytest.raises(ValueError):
+        executor.get(KEY, _unexpected)
+    # terminado con error sale de pendientes: el siguiente get recalcula en serie
+    assert KEY not in executor.cache and KEY not in executor._pending
+    assert executor.get(KEY, lambda: 3) == 3
+
+
+def test_shut_down_pool_falls_back_to_serial(executor):
+    executor._pool.shutdown()
+    executor.submit(KEY, _unexpected)
+    assert not executor.parallel and executor.mode == "serial"
+    assert executor.get(KEY, lambda: 7) == 7
+
+
+def test_broken_process_pool_falls_back_to_serial():
+    ex = SectionExecutor(ResultsCache(), mode="process", max_workers=1)
+    try:
+        ex.submit(KEY, _crash)
+        # el proceso murió: get recalcula en serie y el ejecutor queda en modo serie
+        assert ex.get(KEY, lambda: 7) == 7
+        assert ex.mode == "serial" and not ex.parallel
+        ex.submit(("otra",), _crash)
+        assert ex.get(("otra",), lambda: 8) == 8
+    finally:
+        ex.shutdown()
+
+
+def test_serial_mode_computes_on_get():
+    ex = SectionExecutor(ResultsCache(), mode="serial")
+    ex.submit(KEY, _unexpected)
+    assert ex.get(KEY, lambda: 5) == 5 and ex.get(KEY, _unexpected) == 5
+    with pytest.raises(ValueError):
+        SectionExecutor(ResultsCache(), mode="gpu")
@@ -0,0 +1,72 @@
+# tests/test_filters.py — Índice categórico de filtros contra isin y groupby de pandas
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from filters import CategoricalIndex
+
+
+@pytest.fixture
+def df(rng):
+    n = 500
+    df = pd.DataFrame({
+        "Sexo": rng.choice(["M", "F"], n),
+        # categorías en orden no alfabético: groupby sigue ese orden
+        "Estrato": pd.Categorical(rng.choice(["3", "1", "10", "2"], n), categories=["10", "3", "2", "1", "9"]),
+        "Nomofobia?": rng.choice(["Sí", "No"], n).astype(object),
+    })
+    df.loc[rng.random(n) < 0.05, "Sexo"] = np.nan  # código -1
+    df.loc[rng.random(n) < 0.05, "Nomofobia?"] = None
+    df.loc[rng.random(n) < 0.05, "Estrato"] = np.nan
+    return df
+
+
+def _isin_rows(df, selection):
+    keep = np.ones(len(df), dtype=bool)
+    for col, chosen in selection.items():
+        keep &= df[col].isin(chosen).to_numpy()
+    return np.flatnonzero(keep)
+
+
+SELECTIONS = [
+    {},
+    {"Sexo": ["M", "F"], "Estrato": ["1", "2", "3", "10"], "Nomofobia?": ["Sí", "No"]},
+    {"Sexo": ["F"], "Estrato": ["10", "2"]},
+    {"Estrato": []},
+    {"Sexo": ["M"], "Nomofobia?": []},
+    {"Estrato": ["9", "7"]},  # categoría sin filas y nivel inexistente
+    {"Sexo": ["X", "F"], "Nomofobia?": ["Sí"]},
+]
+
+
+@pytest.mark.parametrize("selection", SELECTIONS)
+def test_rows_match_isin_chain(df, selection):
+    index = CategoricalIndex(df)
+    np.testing.assert_array_equal(index.rows(selection), _isin_rows(df, selection))
+
+
+def test_options_exclude_missing(df):
+    index = CategoricalIndex(df)
+    assert sorted(index.options("Sexo")) == ["F", "M"]
+    assert index.codes["Sexo"].min() == -1
+    assert index.options("Edad") == []
+
+
+@pytest.mark.parametrize("col", ["Sexo", "Estrato", "Nomofobia?"])
+@pytest.mark.parametrize("selection", SELECTIONS[:3] + [{"Sexo": ["F"]}])
+def test_partition_matches_groupby(df, col, selection):
+    index = CategoricalIndex(df)
+    rows = index.rows(selection)
+    sub = df.iloc[rows].reset_index(drop=True)
+    expected = [(level, g.index.to_numpy()) for level, g in sub.groupby(col, observed=True)]
+    parts = index.partition(col, rows)
+    assert list(parts) == [level for level, _ in expected]
+    for (_, pos), (_, exp) in zip(parts.items(), expected):
+        np.testing.assert_array_equal(pos, exp)
+
+
+def test_partition_of_empty_selection_is_empty(df):
+    index = CategoricalIndex(df)
+    assert index.partition("Estrato", index.rows({"Estrato": []})) == {}
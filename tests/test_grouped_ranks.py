@@ -0,0 +1,102 @@
+# tests/test_grouped_ranks.py — Kruskal–Wallis y Dunn por lotes contra scipy / scikit-posthocs
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import analysis
+from filters import CategoricalIndex
+import grouped_ranks
+from grouped_ranks import P_ADJUST, adjust_pvalues, screen
+
+VALUES = ["v_ties", "v_cont"]
+GROUPS = ["g3", "g5"]
+
+
+@pytest.fixture
+def data(rng):
+    n = 400
+    df = pd.DataFrame({
+        "v_ties": rng.integers(1, 8, n).astype(float),
+        "v_cont": rng.normal(size=n),
+        "g3": rng.choice(["a", "b", "c"], n),
+        "g5": pd.Categorical(rng.choice(list("12345"), n)),
+    })
+    df["v_cont"] += (df["g3"] == "b") * 0.4
+    df.loc[rng.random(n) < 0.05, "v_ties"] = np.nan
+    df.loc[rng.random(n) < 0.05, "g3"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("method", P_ADJUST)
+def test_adjust_pvalues_matches_statsmodels(rng, method):
+    from statsmodels.stats.multitest import multipletests
+    p = rng.uniform(0, 0.2, 25)
+    np.testing.assert_allclose(adjust_pvalues(p, method), multipletests(p, method=method)[1], rtol=1e-12)
+
+
+def test_kruskal_matches_scipy(data):
+    res = screen(data, VALUES, GROUPS)["kruskal"].set_index(["variable", "grupo"])
+    for v in VALUES:
+        for g in GROUPS:
+            sub = data[[v, g]].dropna()
+            groups = [s[v].to_numpy() for _, s in sub.groupby(g, observed=True)]
+            H, p = stats.kruskal(*groups)
+            assert res.loc[(v, g), "H"] == pytest.approx(H, rel=1e-10)
+            assert res.loc[(v, g), "p"] == pytest.approx(p, rel=1e-8)
+            assert res.loc[(v, g), "n"] == len(sub)
+
+
+@pytest.mark.parametrize("method", P_ADJUST)
+def test_dunn_matches_scikit_posthocs(data, method):
+    sp = pytest.importorskip("scikit_posthocs")
+    res = screen(data, VALUES, GROUPS, p_adjust=method)["dunn"]
+    for v in VALUES:
+        for g in GROUPS:
+            sub = data[[v, g]].dropna().astype({g: object})
+            expected = sp.posthoc_dunn(sub, val_col=v, group_col=g, p_adjust=method)
+            got = res[(v, g)].loc[expected.index, expected.columns]
+            np.testing.assert_allclose(got.to_numpy(), expected.to_numpy(), rtol=1e-8, atol=1e-12)
+
+
+def test_dunn_z_is_antisymmetric(data):
+    z = screen(data, VALUES, GROUPS)["dunn_z"][("v_cont", "g3")]
+    np.testing.assert_allclose(z.to_numpy(), -z.to_numpy().T)
+    assert z.loc["b", "a"] > 0  # el grupo "b" tiene rangos mayores
+
+
+def test_per_grouping_fallback_gives_same_result(data, monkeypatch):
+    joint = screen(data, VALUES, GROUPS)
+    monkeypatch.setattr(grouped_ranks, "MAX_BINS", 1)
+    split = screen(data, VALUES, GROUPS)
+    pd.testing.assert_frame_equal(joint["kruskal"], split["kruskal"])
+    for key, mat in joint["dunn"].items():
+        pd.testing.assert_frame_equal(mat, split["dunn"][key])
+
+
+def test_single_level_has_no_dunn(data):
+    df = data.assign(g1="solo")
+    out = screen(df, ["v_cont"], ["g1"])
+    assert np.isnan(out["kruskal"]["H"].iloc[0]) and out["dunn"] == {}
+
+
+def test_analysis_dunn_uses_screen(data):
+    expected = screen(data, ["v_cont"], ["g5"], p_adjust="holm")["dunn"][("v_cont", "g5")]
+    pd.testing.assert_frame_equal(analysis.dunn(data, "v_cont", "g5", p_adjust="holm"), expected)
+    assert analysis.dunn(data.assign(g1="solo"), "v_cont", "g1").empty
+
+
+def test_partitions_from_filter_index_give_same_result(data):
+    index = CategoricalIndex(data, columns=GROUPS)
+    rows = index.rows({"g5": ["1", "2", "4"]})
+    sub = data.iloc[rows].reset_index(drop=True)
+    partitions = {g: index.partition(g, rows) for g in GROUPS}
+    expected = screen(sub, VALUES, GROUPS)
+    got = screen(sub, VALUES, GROUPS, partitions=partitions)
+    pd.testing.assert_frame_equal(got["kruskal"], expected["kruskal"])
+    for key, table in expected["dunn"].items():
+        pd.testing.assert_frame_equal(got["dunn"][key], table)
+    pd.testing.assert_frame_equal(analysis.dunn(sub, "v_ties", "g3", partition=partitions["g3"]),
+                                  analysis.dunn(sub, "v_ties", "g3"))
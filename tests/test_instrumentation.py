@@ -0,0 +1,146 @@
+# tests/test_instrumentation.py — Spans del Profiler: picos anidados, tracemalloc y traza Chrome
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+import instrumentation
+from instrumentation import Profiler
+
+MB = 1_000_000
+
+
+@pytest.fixture(autouse=True)
+def no_tracing():
+    if tracemalloc.is_tracing():
+        pytest.skip("tracemalloc ya está activo en este proceso")
+    yield
+    assert not tracemalloc.is_tracing() and instrumentation._memory_users == 0
+
+
+def _allocate(mb):
+    block = np.ones(int(mb * MB), dtype=np.uint8)
+    del block
+
+
+def test_nested_peaks_propagate_to_parent():
+    prof = Profiler()
+    prof.track_memory = True
+    with prof.span("padre") as parent:
+        _allocate(30)  # antes del hijo: el reinicio del contador no debe borrarlo
+        with prof.span("hijo") as child:
+            with prof.span("nieto") as grandchild:
+                _allocate(20)
+        with prof.span("hermano") as sibling:
+            _allocate(5)
+    assert grandchild.peak_mb == pytest.approx(20, abs=1)
+    assert child.peak_mb >= grandchild.peak_mb
+    assert sibling.peak_mb == pytest.approx(5, abs=1)
+    assert parent.peak_mb == pytest.approx(30, abs=1)
+    assert [s.depth for s in (parent, child, grandchild, sibling)] == [0, 1, 2, 1]
+
+
+def test_child_peak_above_parent_allocations():
+    prof = Profiler()
+    prof.track_memory = True
+    with prof.span("padre") as parent:
+        _allocate(5)
+        with prof.span("hijo"):
+            _allocate(25)
+    assert parent.peak_mb == pytest.approx(25, abs=1)
+
+
+def test_tracing_is_reference_counted_across_profilers():
+    a, b = Profiler(), Profiler()
+    a.track_memory = b.track_memory = True
+    with a.span("a"):
+        with a.span("a.hijo"):
+            assert instrumentation._memory_users == 1  # sólo el span raíz toma referencia
+        with b.span("b"):
+            assert tracemalloc.is_tracing() and instrumentation._memory_users == 2
+    # ambas raíces cerradas: no queda ninguna referencia
+    assert not tracemalloc.is_tracing()
+
+    span_b = b.span("b2")
+    span_b.__enter__()
+    with a.span("a2"):
+        pass
+    assert tracemalloc.is_tracing()
+    span_b.__exit__(None, None, None)
+    assert not tracemalloc.is_tracing()
+
+
+def test_tracing_stops_after_exception_in_root_span():
+    prof = Profiler()
+    prof.track_memory = True
+    with pytest.raises(ValueError):
+        with prof.span("raíz"):
+            with prof.span("hijo"):
+                raise ValueError("falla dentro del span")
+    assert not tracemalloc.is_tracing()
+    assert [s.name for s in prof.records] == ["hijo", "raíz"] and not prof._stack
+
+
+def test_turning_tracking_off_mid_span_releases_reference():
+    prof = Profiler()
+    prof.track_memory = True
+    with prof.span("raíz") as root:
+        prof.track_memory = False
+        with prof.span("hijo") as child:
+            pass
+    assert not tracemalloc.is_tracing()
+    assert child.peak_mb is None and root.peak_mb is not None
+
+
+def test_without_tracking_memory_is_not_measured():
+    prof = Profiler()
+    with prof.span("raíz") as root:
+        assert not tracemalloc.is_tracing()
+    assert root.peak_mb is None
+
+
+def test_cache_notes_reach_open_spans():
+    prof = Profiler()
+    with prof.span("sección") as outer:
+        with prof.span("prueba") as inner:
+            prof.note_cache(True)
+        prof.note_cache(False)
+    assert (outer.hits, outer.misses) == (1, 1) and (inner.hits, inner.misses) == (1, 0)
+
+
+def test_chrome_trace_format():
+    prof = Profiler()
+    prof.new_run("script")
+    with prof.span("sección", rows=100, column="Edad"):
+        with prof.span("prueba:kruskal", rows=100):
+            pass
+    trace = json.loads(prof.to_chrome_trace())
+    assert trace["displayTimeUnit"] == "ms"
+    events = {e["name"]: e for e in trace["traceEvents"]}
+    assert set(events) == {"sección", "prueba:kruskal"}
+    for e in events.values():
+        assert e["ph"] == "X" and isinstance(e["pid"], int) and isinstance(e["tid"], int)
+        assert e["dur"] >= 0 and e["args"]["run"] == 1 and e["args"]["rows"] == 100
+    parent, child = events["sección"], events["prueba:kruskal"]
+    # microsegundos y anidados: el hijo cae dentro del intervalo del padre
+    assert parent["ts"] <= child["ts"] and child["ts"] + child["dur"] <= parent["ts"] + parent["dur"]
+    assert parent["args"]["column"] == "Edad"
+    span = next(s for s in prof.records if s.name == "sección")
+    assert parent["ts"] == pytest.approx(span.start * 1e6) and parent["dur"] == pytest.approx(span.wall * 1e6)
+
+
+def test_table_lists_last_run_in_start_order():
+    prof = Profiler()
+    prof.new_run()
+    with prof.span("viejo"):
+        pass
+    prof.new_run("section_kruskal")
+    with prof.span("b"):
+        with prof.span("c"):
+            pass
+    assert prof.table()["name"].tolist() == ["b", "c"]
+    assert prof.table(run=1)["name"].tolist() == ["viejo"]
+    assert prof.run_label == "section_kruskal" and not prof.in_script
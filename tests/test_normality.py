@@ -0,0 +1,123 @@
+# tests/test_normality.py — Pruebas de normalidad y pares QQ contra scipy.stats
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import inspect
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import analysis
+import normality
+from normality import QQ_FULL_N, QQ_POINTS, SHAPIRO_MAX, anderson_pvalue, normality_table, qq_pairs
+
+
+def _legacy_anderson(x):
+    # estadístico y valores críticos con la API anterior a `method` (aviso de scipy 1.17)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", FutureWarning)
+        return stats.anderson(x, "norm")
+
+
+@pytest.fixture
+def frame(rng):
+    n = 600
+    df = pd.DataFrame({"normal": rng.normal(size=n), "skewed": rng.exponential(size=n),
+                       "ties": np.round(rng.normal(3, 1, n)), "heavy": rng.standard_t(3, n)})
+    # distintos patrones de NaN: columnas con n distintos, procesadas en bloques distintos
+    df.loc[rng.random(n) < 0.1, "skewed"] = np.nan
+    df.loc[:4, "heavy"] = np.nan
+    return df
+
+
+@pytest.mark.parametrize("max_bytes", [normality.DEFAULT_MAX_BYTES, 1])
+def test_tests_match_scipy(frame, max_bytes):
+    res = normality_table(frame, frame.columns, max_bytes=max_bytes)
+    for col in frame.columns:
+        x = frame[col].dropna().to_numpy()
+        r = res[col]
+        ad = _legacy_anderson(x)
+        assert r["n"] == r["shapiro_n"] == len(x)
+        assert r["shapiro_p"] == pytest.approx(stats.shapiro(x).pvalue, rel=1e-10)
+        assert r["anderson_stat"] == pytest.approx(ad.statistic, rel=1e-9)
+        np.testing.assert_allclose(r["anderson_critical"], ad.critical_values)
+        np.testing.assert_array_equal(r["anderson_significance"], ad.significance_level)
+        k2 = stats.normaltest(x)
+        assert (r["dagostino_stat"], r["dagostino_p"]) == pytest.approx((k2.statistic, k2.pvalue), rel=1e-10)
+
+
+@pytest.mark.skipif("method" not in inspect.signature(stats.anderson).parameters,
+                    reason="stats.anderson(method=...) requiere scipy >= 1.17")
+def test_anderson_pvalue_agrees_with_scipy_tables(rng):
+    for n in (20, 100, 1000):
+        for df_t in (3, 5, 10, 30, 300):
+            x = rng.standard_t(df_t, n)
+            ref = stats.anderson(x, "norm", method="interpolate")
+            # scipy interpola tablas y recorta a [0.01, 0.15]
+            ours = np.clip(anderson_pvalue(ref.statistic, n), 0.01, 0.15)
+            assert ours == pytest.approx(ref.pvalue, abs=0.005)
+
+
+def test_anderson_pvalue_is_monotone_beyond_table():
+    a2 = np.concatenate([np.linspace(0.01, 20, 2000), [153.0, 306.0, 717.0, 46_000.0]])
+    p = anderson_pvalue(a2, 200_000)
+    assert np.all(np.diff(p) <= 0)
+    assert p[-4:].tolist() == [0.0, 0.0, 0.0, 0.0]
+
+
+@pytest.mark.parametrize("kind", ["exponential", "likert"])
+def test_anderson_pvalue_large_non_normal(rng, kind):
+    n = 200_000
+    x = rng.exponential(size=n) if kind == "exponential" else rng.integers(1, 6, n).astype(float)
+    r = normality_table(pd.DataFrame({"x": x}), ["x"], qq_points=0)["x"]
+    assert r["anderson_stat"] > 300
+    assert r["anderson_p"] < 1e-10
+    assert r["dagostino_p"] < 1e-10
+
+
+def test_large_sample_uses_stratified_shapiro(rng):
+    n = 3 * SHAPIRO_MAX + 17
+    df = pd.DataFrame({"x": rng.normal(size=n)})
+    r = normality_table(df, ["x"])["x"]
+    assert r["n"] == n and r["shapiro_n"] == SHAPIRO_MAX
+    assert 0.0 < r["shapiro_p"] <= 1.0
+    assert r["dagostino_p"] == pytest.approx(stats.normaltest(df["x"]).pvalue, rel=1e-10)
+    sample = normality._stratified_sample(np.sort(df["x"].to_numpy()), SHAPIRO_MAX, np.random.default_rng(0))
+    assert len(sample) == SHAPIRO_MAX and np.all(np.diff(sample) >= 0)
+
+
+@pytest.mark.parametrize("n", [3, 50, QQ_FULL_N])
+def test_qq_pairs_match_probplot(rng, n):
+    x = np.sort(rng.gamma(2.0, size=n))
+    osm, osr, slope, intercept = qq_pairs(x)
+    (ref_m, ref_r), (ref_slope, ref_intercept, _) = stats.probplot(x)
+    np.testing.assert_allclose(osm, ref_m, atol=1e-12)
+    np.testing.assert_array_equal(osr, ref_r)
+    assert (slope, intercept) == pytest.approx((ref_slope, ref_intercept), rel=1e-10)
+
+
+def test_qq_pairs_downsample_above_threshold(rng):
+    x = np.sort(rng.normal(size=QQ_FULL_N + 1))
+    osm, osr, _, _ = qq_pairs(x)
+    assert len(osm) == len(osr) == QQ_POINTS
+    assert (osr[0], osr[-1]) == (x[0], x[-1])
+    assert np.all(np.diff(osm) > 0)
+
+
+def test_too_few_observations():
+    df = pd.DataFrame({"x": [1.0, np.nan, 2.0]})
+    r = normality_table(df, ["x"])["x"]
+    assert r["n"] == 2 and np.isnan(r["shapiro_p"]) and r["qq"] is None
+
+
+def test_qq_only_mode_skips_tests(frame):
+    res = normality_table(frame, ["normal"], tests=False)["normal"]
+    assert np.isnan(res["shapiro_p"]) and res["qq"] is not None
+
+
+def test_run_normality_delegates(frame):
+    r = analysis.run_normality(frame["ties"])
+    assert "qq" not in r
+    assert r["shapiro_p"] == pytest.approx(stats.shapiro(frame["ties"]).pvalue, rel=1e-10)
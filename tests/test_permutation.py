@@ -0,0 +1,94 @@
+# tests/test_permutation.py — P-valores por permutación contra scipy
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import numpy as np
+import pandas as pd
+import pytest
+from scipy import stats
+
+import analysis
+from permutation import PERMUTATION_MAX_N, _batch_exceed, permutation_test
+
+
+def test_statistic_matches_scipy(rng):
+    a, b, c = rng.normal(size=12), rng.normal(0.5, size=15), rng.normal(1, size=9)
+    kw = permutation_test([a, b, c], kind="kw", n_perm=10, early_stop=False)
+    assert kw["statistic"] == pytest.approx(stats.kruskal(a, b, c).statistic, rel=1e-12)
+    mw = permutation_test([a, b], kind="mw", n_perm=10, early_stop=False)
+    u = stats.mannwhitneyu(a, b).statistic
+    assert mw["statistic"] == pytest.approx(abs(u - len(a) * len(b) / 2), rel=1e-12)
+
+
+def test_mann_whitney_close_to_exact(rng):
+    a, b = rng.normal(size=8), rng.normal(0.8, size=9)
+    exact = stats.mannwhitneyu(a, b, method="exact").pvalue
+    perm = permutation_test([a, b], kind="mw", n_perm=40_000, early_stop=False)
+    assert perm["n_perm"] == 40_000
+    assert perm["p"] == pytest.approx(exact, abs=0.01)
+    assert perm["p_ci"][0] <= exact <= perm["p_ci"][1]
+
+
+def test_kruskal_close_to_scipy_permutation_test(rng):
+    groups = [np.round(rng.normal(m, 1, n)) for m, n in ((0, 10), (0.6, 12), (0.2, 8))]
+    ref = stats.permutation_test(groups, lambda *g, axis: stats.kruskal(*g, axis=axis).statistic,
+                                 permutation_type="independent", vectorized=True, n_resamples=20_000,
+                                 alternative="greater", random_state=1).pvalue
+    perm = permutation_test(groups, kind="kw", n_perm=20_000, early_stop=False)
+    assert perm["p"] == pytest.approx(ref, abs=0.015)
+
+
+def test_early_stop_on_clear_decision(rng):
+    a, b = rng.normal(size=60), rng.normal(1.5, size=60)
+    res = permutation_test([a, b], kind="mw")
+    assert res["stopped_early"] and res["n_perm"] < 10_000
+    assert res["p_ci"][1] < 0.05
+
+
+def test_batches_do_not_change_counts(rng):
+    ranks = stats.rankdata(rng.normal(size=40))
+    sizes = np.array([15, 25])
+    starts = np.array([0, 15])
+    seed = np.random.SeedSequence(3)
+    whole = _batch_exceed(ranks, sizes, starts, 30.0, "mw", 500, seed)
+    chunked = _batch_exceed(ranks, sizes, starts, 30.0, "mw", 500, seed, max_bytes=1)
+    assert whole == chunked
+
+
+def _frame(rng, n):
+    return pd.DataFrame({"Horas_Uso": rng.normal(size=n), "Nomofobia?": rng.choice(["Sí", "No"], n),
+                         "Nomofobia": rng.normal(size=n), "Estrato": rng.choice(list("1234"), n)})
+
+
+def test_analysis_uses_permutation_below_limit(rng):
+    df = _frame(rng, 200)
+    mw = analysis.mann_whitney(df, p_method="permutation")
+    assert "n_perm" in mw and mw["p_asymptotic"] == analysis.mann_whitney(df)["p"]
+    kw = analysis.kruskal(df, p_method="permutation")
+    assert "n_perm" in kw and kw["p_asymptotic"] == analysis.kruskal(df)["p"]
+
+
+def test_analysis_falls_back_to_asymptotic_above_limit(rng):
+    df = _frame(rng, PERMUTATION_MAX_N + 1)
+    for test in (analysis.mann_whitney, analysis.kruskal):
+        res = test(df, p_method="permutation")
+        assert res["permutation_skipped"] == PERMUTATION_MAX_N + 1
+        assert "n_perm" not in res and res["p"] == test(df)["p"]
+
+
+def test_empty_groups_are_dropped(rng):
+    a, b = rng.normal(size=30), rng.normal(0.8, 1, 30)
+    ref = permutation_test([a, b], n_perm=2000, early_stop=False)
+    for groups in ([[], a, b], [a, [np.nan], b], [a, b, []]):
+        res = permutation_test(groups, n_perm=2000, early_stop=False)
+        assert res["statistic"] == ref["statistic"] and res["p"] == ref["p"]
+    with pytest.raises(ValueError):
+        permutation_test([a, []], kind="mw")
+
+
+@pytest.mark.parametrize("empty", ["1", "4"], ids=["primero", "ultimo"])
+def test_analysis_keeps_nan_result_with_empty_stratum(rng, empty):
+    df = _frame(rng, 200)
+    df.loc[df["Estrato"] == empty, "Nomofobia"] = np.nan
+    res = analysis.kruskal(df, p_method="permutation")
+    assert np.isnan(res["p"]) and "n_perm" not in res
+    assert res.keys() == analysis.kruskal(df).keys()
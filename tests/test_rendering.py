@@ -0,0 +1,102 @@
+# tests/test_rendering.py — Agregados del modo N grande contra cálculos directos
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import rendering
+from rendering import binned_kde, binned_trend, box_stats, stratified_sample
+
+
+def _direct_kde(v, grid):
+    """KDE gaussiano exacto con el mismo ancho de Silverman que binned_kde."""
+    iqr = np.subtract(*np.percentile(v, [75, 25]))
+    spread = min(v.std(), iqr / 1.34) if iqr > 0 else v.std()
+    bw = 1.06 * spread * len(v) ** (-1 / 5)
+    dens = np.exp(-0.5 * ((grid[:, None] - v[None, :]) / bw) ** 2).sum(axis=1)
+    return dens / dens.max()
+
+
+@pytest.mark.parametrize("n", [2, 3, 5, 50, 2000])
+def test_binned_kde_stays_on_grid(rng, n):
+    grid, dens = binned_kde(rng.normal(size=n))
+    assert len(grid) == len(dens) == rendering.KDE_GRID
+    assert dens.max() == pytest.approx(1.0)
+
+
+def test_binned_kde_constant_series():
+    grid, dens = binned_kde(np.full(10, 3.0))
+    assert grid.tolist() == [3.0] and dens.tolist() == [1.0]
+
+
+@pytest.mark.parametrize("n", [5, 200, 20000])
+def test_binned_kde_matches_direct_kde(rng, n):
+    v = rng.gamma(2.0, size=n)
+    grid, dens = binned_kde(v)
+    # el binning en KDE_GRID celdas mueve cada punto a lo sumo media celda
+    np.testing.assert_allclose(dens, _direct_kde(v, grid), atol=0.03)
+
+
+def test_box_stats_match_numpy(rng):
+    v = np.concatenate([rng.normal(size=500), [8.0, -9.0, np.nan]])
+    bs = box_stats(v)
+    clean = v[~np.isnan(v)]
+    q1, med, q3 = np.percentile(clean, [25, 50, 75])
+    assert (bs["q1"], bs["median"], bs["q3"]) == (q1, med, q3)
+    assert bs["lowerfence"] == clean[clean >= q1 - 1.5 * (q3 - q1)].min()
+    assert bs["upperfence"] == clean[clean <= q3 + 1.5 * (q3 - q1)].max()
+    assert bs["n"] == 502 and bs["mean"] == pytest.approx(clean.mean())
+
+
+def test_binned_trend_recovers_line(rng):
+    x = rng.uniform(0, 10, 50_000)
+    y = 2.5 * x - 1.0 + rng.normal(0, 0.5, len(x))
+    xs, ys = binned_trend(x, y)
+    slope = (ys[1] - ys[0]) / (xs[1] - xs[0])
+    assert slope == pytest.approx(2.5, abs=0.01)
+    assert ys[0] - slope * xs[0] == pytest.approx(-1.0, abs=0.05)
+
+
+def test_stratified_sample_keeps_small_groups(rng):
+    df = pd.DataFrame({"g": ["grande"] * 50_000 + ["chico"] * 60, "v": rng.normal(size=50_060)})
+    sample = stratified_sample(df, by="g")
+    assert len(sample) < 10_000
+    assert (sample["g"] == "chico").sum() >= 40
+
+
+def _survey(rng, n=20_000):
+    df = pd.DataFrame({"x": rng.normal(size=n), "Estrato": rng.choice(["5", "2", "3"], n)})
+    df["y"] = df["x"] * df["Estrato"].astype(int)
+    return df
+
+
+def test_violin_traces_have_matching_lengths(rng):
+    df = _survey(rng)
+    df.loc[:2, "Estrato"] = "1"  # grupo de 3 observaciones dentro de un dataset grande
+    fig = rendering.violin_figure(df, "Estrato", "y", title="t")
+    for trace in fig.data:
+        if trace.type == "scatter":
+            assert len(trace.x) == len(trace.y)
+
+
+def test_scatter_trendlines_share_point_colours(rng):
+    fig = rendering.scatter_figure(_survey(rng), "x", "y", color="Estrato", trendline="ols")
+    points = {t.name: t.marker.color for t in fig.data if t.mode == "markers"}
+    lines = {t.name.split()[-1]: t.line.color for t in fig.data if t.mode == "lines"}
+    assert set(points) == set(lines) == {"2", "3", "5"}
+    assert points == lines
+
+
+def test_figures_accept_partitions_from_filter_index(rng):
+    from filters import CategoricalIndex
+    df = _survey(rng)
+    df.loc[:40, "Estrato"] = None
+    part = CategoricalIndex(df, columns=["Estrato"]).partition("Estrato")
+    np.testing.assert_array_equal(rendering._group_sizes(df, "Estrato", part),
+                                  rendering._group_sizes(df, "Estrato"))
+    for make in (rendering.violin_figure, rendering.box_figure):
+        with_part, plain = make(df, "Estrato", "y", title="t", partition=part), make(df, "Estrato", "y", title="t")
+        assert [t.name for t in with_part.data] == [t.name for t in plain.data]
+    fig = rendering.scatter_figure(df, "x", "y", color="Estrato", trendline="ols", partition=part)
+    assert {t.name.split()[-1] for t in fig.data if t.mode == "lines"} == {"2", "3", "5"}
@@ -0,0 +1,50 @@
+# tests/test_results_cache.py — Caché LRU de resultados y claves de filtros
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import numpy as np
+import pandas as pd
+
+import analysis
+from results_cache import ResultsCache, filter_key
+
+
+def test_filter_key_ignores_selection_order():
+    a = filter_key(3, ["M", "F"], ["3", "1", "2"], ["Sí", "No"])
+    b = filter_key(3, ("F", "M"), ("1", "2", "3"), ("No", "Sí"))
+    assert a == b and hash(a) == hash(b)
+    assert filter_key(4, ["F", "M"], ["1", "2", "3"], ["No", "Sí"]) != a
+    assert filter_key(3, ["F"], ["1", "2", "3"], ["No", "Sí"]) != a
+
+
+def test_lru_evicts_least_recently_used():
+    cache = ResultsCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get_or_compute("a", lambda: 0) == 1  # "a" pasa a ser el más reciente
+    cache.put("c", 3)
+    assert "b" not in cache and "a" in cache and "c" in cache and len(cache) == 2
+    cache.put("a", 10)  # reescribir también renueva
+    cache.put("d", 4)
+    assert "c" not in cache and cache.get_or_compute("a", lambda: 0) == 10
+
+
+def test_get_or_compute_counts_hits_and_misses():
+    cache = ResultsCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_compute("k", lambda: calls.append(1) or 42) == 42
+    assert len(calls) == 1 and (cache.hits, cache.misses) == (2, 1)
+    cache.clear()
+    assert len(cache) == 0 and (cache.hits, cache.misses) == (0, 0)
+
+
+def test_spearman_pairs_reuse_table(rng):
+    x = rng.normal(size=80)
+    df = pd.DataFrame({"Horas_Uso": x, "Nomofobia": x + rng.normal(size=80), "Autoestima": rng.normal(size=80)})
+    df.loc[[3, 7], "Nomofobia"] = np.nan
+    tbl = analysis.spearman_table(df, "Horas_Uso", list(df.columns), bootstrap=False)
+    pairs = analysis.spearman_pairs(tbl, ["Nomofobia", "Autoestima", "Ansiedad_social"])
+    assert list(pairs) == ["Nomofobia", "Autoestima"]
+    for v, (rho, p) in pairs.items():
+        assert (rho, p) == analysis.spearman_pair(df, "Horas_Uso", v)[:2]
+    assert analysis.spearman_pairs(analysis.spearman_table(df, "Horas_Uso", ["Horas_Uso"]), ["Nomofobia"]) == {}
@@ -0,0 +1,88 @@
+# tests/test_streaming.py — Acumuladores combinables contra numpy / pandas
+# Autor: Johann Smith Rivera & Julian Mateo Valderrama
+
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import write_survey
+from data_loader import clean_dataframe, compact_dataframe, read_source
+from filters import FILTER_COLS
+from streaming import GroupedDescriptives, Moments, QuantileSketch, frame_descriptives, stream_descriptives
+
+COLS = ["Horas_Uso", "Nomofobia", "Autoestima"]
+
+
+def test_moments_merge_matches_numpy(rng):
+    v = rng.normal(100, 15, 10_000)
+    v[rng.random(len(v)) < 0.05] = np.nan
+    left, right = Moments(), Moments()
+    for chunk in np.array_split(v[:6000], 7):
+        left.update(chunk)
+    right.update(v[6000:])
+    m = left.merge(right)
+    clean = v[~np.isnan(v)]
+    assert m.n == len(clean)
+    assert m.mean == pytest.approx(clean.mean(), rel=1e-12)
+    assert m.std == pytest.approx(clean.std(ddof=1), rel=1e-12)
+
+
+def test_sketch_is_exact_below_k(rng):
+    v = rng.exponential(size=1500)
+    sk = QuantileSketch(k=2048)
+    for chunk in np.array_split(v, 4):
+        sk.update(chunk)
+    assert sk.exact
+    qs = [0.0, 0.1, 0.25, 0.5, 0.75, 0.99, 1.0]
+    np.testing.assert_allclose(sk.quantiles(qs), np.percentile(v, 100 * np.array(qs)))
+
+
+def test_sketch_rank_error_after_compaction(rng):
+    v = rng.lognormal(size=300_000)
+    a, b = QuantileSketch(seed=1), QuantileSketch(seed=2)
+    for chunk in np.array_split(v[:200_000], 20):
+        a.update(chunk)
+    b.update(v[200_000:])
+    sk = a.merge(b)
+    assert not sk.exact and sk.n == len(v)
+    qs = np.array([0.01, 0.25, 0.5, 0.75, 0.99])
+    ranks = np.searchsorted(np.sort(v), sk.quantiles(qs)) / len(v)
+    np.testing.assert_allclose(ranks, qs, atol=0.01)
+    assert (sk.min, sk.max) == (v.min(), v.max())
+
+
+def test_sketch_histogram_total(rng):
+    v = rng.normal(size=50_000)
+    sk = QuantileSketch()
+    sk.update(v)
+    counts, edges = sk.histogram(bins=30)
+    assert counts.sum() == pytest.approx(len(v))
+    exact, _ = np.histogram(v, bins=edges)
+    # cada celda dentro del error del sketch (fracción de n)
+    assert np.abs(counts - exact).max() / len(v) < 0.01
+
+
+@pytest.fixture(scope="module")
+def survey(tmp_path_factory):
+    return write_survey(tmp_path_factory.mktemp("encuesta") / "encuesta.csv", 3000, seed=4)
+
+
+def test_grouped_table_matches_pandas_describe(survey):
+    df = clean_dataframe(read_source(survey))
+    acc = GroupedDescriptives(COLS, by=FILTER_COLS).update(df)
+    selection = {"Sexo": ["Mujer"], "Estrato": ["2", "3", "4"]}
+    sub = df[df["Sexo"].isin(selection["Sexo"]) & df["Estrato"].isin(selection["Estrato"])]
+    expected = sub[COLS].describe().T.rename(columns={"50%": "mediana"})
+    table = acc.table(selection)
+    # menos de k valores por columna: cuantiles exactos
+    np.testing.assert_allclose(table[expected.columns].to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+def test_frame_descriptives_match_streaming(survey):
+    streamed = stream_descriptives(survey, COLS, by=FILTER_COLS, chunksize=700)
+    # el dashboard parte del DataFrame compacto (categóricas, float32 sin pérdida)
+    df = compact_dataframe(clean_dataframe(read_source(survey)))
+    framed = frame_descriptives(df, COLS, by=FILTER_COLS, chunksize=900)
+    assert set(framed.cells) == set(streamed.cells)
+    for selection in ({}, {"Nomofobia?": ["Sí"]}, {"Sexo": ["Hombre"], "Estrato": ["5", "6"]}):
+        np.testing.assert_allclose(framed.table(selection).to_numpy(), streamed.table(selection).to_numpy(),
+                                   rtol=1e-12)